@@ -6,10 +6,13 @@ client = MongoClient(settings.MONGO_URI, tlsCAFile=certifi.where())
 db = client["TravelBuddy"]
 users_collection = db["Users"]
 flights_collection = db["Flights"]
+flight_offers_cache_collection = db["flight_offers_cache"]
+flight_schedules_collection = db["flight_schedules"]
 destinations_collection = db["Destinations"]
 recommendations_collection = db["Recommendations"]
 trips_collection = db["Trips"]
 hotels_collection = db["hotels"]
+hotel_searches_collection = db["hotel_searches"]
 hotel_bookings_collection = db["hotel_bookings"]
 admins_collection = db["Admins"]
 try:
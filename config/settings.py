@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings
 load_dotenv()
@@ -10,5 +11,54 @@ class Settings:
     RAPIDAPI_HOST = os.getenv("RAPIDAPI_HOST")
     RAPIDAPI_KEY = os.getenv("RAPIDAPI_KEY")
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY_OTHER")
+    # Embedding backend: "openai" (text-embedding-3-small) or "local" (hashed, no network)
+    EMBEDDING_PROVIDER: str = os.getenv("EMBEDDING_PROVIDER", "openai")
+    LOCAL_EMBEDDING_DIM: int = int(os.getenv("LOCAL_EMBEDDING_DIM", "512"))
+    # Batched embedding requests (destination ingest and re-index jobs)
+    EMBED_BATCH_SIZE: int = int(os.getenv("EMBED_BATCH_SIZE", "256"))
+    EMBED_MAX_CONCURRENCY: int = int(os.getenv("EMBED_MAX_CONCURRENCY", "4"))
+    # Query embedding cache (QUERY_CACHE_PATH enables the on-disk tier)
+    QUERY_CACHE_SIZE: int = int(os.getenv("QUERY_CACHE_SIZE", "1024"))
+    QUERY_CACHE_TTL: int = int(os.getenv("QUERY_CACHE_TTL", "86400"))
+    QUERY_CACHE_PATH: str = os.getenv("QUERY_CACHE_PATH", "")
+    # Destination vector index: "exact", "ivf", or "auto" (IVF from ANN_MIN_SIZE destinations).
+    # IVF trades recall for latency; check both with src/scripts/benchmark_ann.py before enabling it
+    DESTINATION_INDEX: str = os.getenv("DESTINATION_INDEX", "exact")
+    ANN_MIN_SIZE: int = int(os.getenv("ANN_MIN_SIZE", "20000"))
+    IVF_N_PROBE: int = int(os.getenv("IVF_N_PROBE", "128"))
+    # Each worker polls the Destinations collection for changes to apply to its index
+    DESTINATION_REFRESH_INTERVAL: float = float(os.getenv("DESTINATION_REFRESH_INTERVAL", "5"))
+    DESTINATION_REFRESH_OVERLAP: float = float(os.getenv("DESTINATION_REFRESH_OVERLAP", "5"))
+    # Seconds a stored recommendation is reused for the same user, query and preferences
+    RECOMMENDATION_REUSE_WINDOW: int = int(os.getenv("RECOMMENDATION_REUSE_WINDOW", "3600"))
+    # Amadeus SDK calls run on a thread pool of this size (max concurrent Amadeus requests)
+    AMADEUS_MAX_WORKERS: int = int(os.getenv("AMADEUS_MAX_WORKERS", "8"))
+    # The Amadeus OAuth token is shared by all workers on the host through this file,
+    # and renewed in the background this many seconds before it expires
+    AMADEUS_TOKEN_PATH: str = os.getenv("AMADEUS_TOKEN_PATH", os.path.join(tempfile.gettempdir(), "travelbuddy_amadeus_token.json"))
+    AMADEUS_TOKEN_REFRESH_AHEAD: int = int(os.getenv("AMADEUS_TOKEN_REFRESH_AHEAD", "300"))
+    # Flight offers are cached in-process and in MongoDB for this many seconds (prices go stale fast)
+    FLIGHT_CACHE_TTL: int = int(os.getenv("FLIGHT_CACHE_TTL", "300"))
+    FLIGHT_CACHE_SIZE: int = int(os.getenv("FLIGHT_CACHE_SIZE", "512"))
+    # Seconds a searched flight offer can still be booked by its offer_id
+    FLIGHT_OFFER_TTL: int = int(os.getenv("FLIGHT_OFFER_TTL", "1800"))
+    # Flight schedules are cached per (carrier, flight number, date): flights departing within a day
+    # are re-checked after FLIGHT_SCHEDULE_TTL_NEAR seconds, later ones after FLIGHT_SCHEDULE_TTL
+    FLIGHT_SCHEDULE_TTL: int = int(os.getenv("FLIGHT_SCHEDULE_TTL", "86400"))
+    FLIGHT_SCHEDULE_TTL_NEAR: int = int(os.getenv("FLIGHT_SCHEDULE_TTL_NEAR", "3600"))
+    # Every worker prefetches schedules of booked flights departing in the next FLIGHT_SCHEDULE_WARM_DAYS
+    # days, every FLIGHT_SCHEDULE_WARM_INTERVAL seconds (0 disables it)
+    FLIGHT_SCHEDULE_WARM_DAYS: int = int(os.getenv("FLIGHT_SCHEDULE_WARM_DAYS", "3"))
+    FLIGHT_SCHEDULE_WARM_INTERVAL: float = float(os.getenv("FLIGHT_SCHEDULE_WARM_INTERVAL", "21600"))
+    # Max concurrent Amadeus searches for one flexible-date calendar request
+    FLIGHT_CALENDAR_CONCURRENCY: int = int(os.getenv("FLIGHT_CALENDAR_CONCURRENCY", "4"))
+
+    # RapidAPI hotel search: one keep-alive connection pool per worker
+    HOTEL_API_TIMEOUT: float = float(os.getenv("HOTEL_API_TIMEOUT", "20"))
+    HOTEL_API_CONNECT_TIMEOUT: float = float(os.getenv("HOTEL_API_CONNECT_TIMEOUT", "5"))
+    HOTEL_API_MAX_CONNECTIONS: int = int(os.getenv("HOTEL_API_MAX_CONNECTIONS", "50"))
+    HOTEL_API_MAX_KEEPALIVE: int = int(os.getenv("HOTEL_API_MAX_KEEPALIVE", "20"))
+    # Same city, dates and party searched within this many seconds is answered from MongoDB
+    HOTEL_CACHE_WINDOW: int = int(os.getenv("HOTEL_CACHE_WINDOW", "3600"))
 
 settings = Settings()
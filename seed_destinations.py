@@ -1,5 +1,6 @@
 from config.databse import db
 from passlib.context import CryptContext
+from src.services.destination_service import upsert_destinations, delete_destinations
 
 pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
 
@@ -92,10 +93,12 @@ def seed():
     ]
 
 
-    destinations_collection = db["Destinations"]
-    destinations_collection.delete_many({})  # clear existing
-    result_dest = destinations_collection.insert_many(destinations)
-    print(f"Inserted {len(result_dest.inserted_ids)} destinations.")
+    # remove destinations that are no longer part of the seed, keep the others
+    # so their stored embeddings are reused instead of recomputed
+    delete_destinations({"name": {"$nin": [d["name"] for d in destinations]}})
+    counts = upsert_destinations(destinations)  # embeds new or changed destinations
+    print(f"Upserted {len(destinations)} destinations: "
+          f"{counts['inserted']} inserted, {counts['modified']} modified, {counts['skipped']} unchanged.")
     
 
     # ---------- Seed Example Users ----------
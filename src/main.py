@@ -3,8 +3,10 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from fastapi import FastAPI
 from config.settings import settings
+from src.services import destination_service, flights_service, hotel_service
+from src.utils import amadeus_session
 from src.routers import hotel_router, auth_router, user_router, destination_router, trip_router, flights_router, \
-    vacation_router
+    vacation_router, metrics_router
 
 app = FastAPI(title="TravelBuddy API", version="1.0.0")
 # Include router with base prefix (e.g., /api/v1)
@@ -16,3 +18,28 @@ app.include_router(trip_router.router, prefix=settings.BASE_ROUTE)
 app.include_router(flights_router.router, prefix=settings.BASE_ROUTE)
 
 app.include_router(vacation_router.router, prefix=settings.BASE_ROUTE)
+app.include_router(metrics_router.router, prefix=settings.BASE_ROUTE)
+
+
+@app.on_event("startup")
+def start_background_jobs():
+    try:
+        destination_service.ensure_destination_indexes()
+    except Exception as e:
+        print("Could not create destination indexes:", e)
+    try:
+        flights_service.ensure_flight_indexes()
+    except Exception as e:
+        print("Could not create flight indexes:", e)
+    try:
+        hotel_service.ensure_hotel_indexes()
+    except Exception as e:
+        print("Could not create hotel indexes:", e)
+    destination_service.start_destination_refresher()
+    amadeus_session.start_token_refresher()
+    flights_service.start_schedule_warmer(flights_router.service)
+
+
+@app.on_event("shutdown")
+async def close_http_clients():
+    await hotel_service.close_http_client()
@@ -50,6 +50,34 @@ class FlightsListSearchResponse(BaseModel):
     departure_date: str
     duration: str
     price: str
+    # seconds since these offers were fetched from Amadeus (0 when fetched for this request)
+    cache_age_seconds: Optional[float] = None
+    # pass back in BookFlightRequest to book exactly this offer
+    offer_id: Optional[str] = None
+
+# Batch search: several routes priced together (multi-city plans, group trips)
+class FlightsBatchSearchRequest(BaseModel):
+    routes: List[FlightsListSearchRequest] = Field(..., min_length=1, max_length=10)
+
+# Flexible-date price calendar
+# Request model: a normal search plus how many days around departure_date to search
+class FlightCalendarRequest(FlightsListSearchRequest):
+    flex_days: int = Field(3, ge=0, le=7)
+
+# Cheapest fare found for one day of the window (no fare when nothing was found)
+class FlightCalendarDay(BaseModel):
+    date: str
+    price: Optional[str] = None
+    flight_number: Optional[str] = None
+    offer_id: Optional[str] = None
+    cache_age_seconds: Optional[float] = None
+
+class FlightCalendarResponse(BaseModel):
+    departure_airport: str
+    arrival_airport: str
+    cabin_class: str
+    currency: str
+    days: List[FlightCalendarDay]
 
 # Flight Info
 # Request model for flight information
@@ -79,18 +107,21 @@ class FlightInfoResponse(BaseModel):
 
 
 # Request model for Book a flight
+# With offer_id the offer returned by a search is booked directly, the search fields are only
+# needed (to search again) without it
 class BookFlightRequest(BaseModel):
     user_email: str
-    flight_number: str
-    departure_airport: str
-    arrival_airport: str
-    departure_date: str
-    cabin_class: str
-    traveler_type: str
-    currency: str
-    adults: int
-    children: int
-    infants: int
+    offer_id: Optional[str] = None
+    flight_number: Optional[str] = None
+    departure_airport: Optional[str] = None
+    arrival_airport: Optional[str] = None
+    departure_date: Optional[str] = None
+    cabin_class: Optional[str] = "Economy"
+    traveler_type: Optional[str] = None
+    currency: Optional[str] = "CAD"
+    adults: Optional[int] = 1
+    children: Optional[int] = 0
+    infants: Optional[int] = 0
 
 
 # Response model for Book a flight
@@ -112,5 +143,7 @@ class DeleteFlightResponse(BaseModel):
 
 class UserBookedFlightsResponse(BaseModel):
     booked_flights: List[BookFlightResponse]
+    # pass as `cursor` to get the next page, None on the last page
+    next_cursor: Optional[str] = None
 
 
@@ -36,6 +36,9 @@ class HotelModel(BaseModel):
     price_per_night: float
     city: str
     currency: str
+    # True when served from a stored search instead of RapidAPI, with the age of that search
+    from_cache: bool = False
+    cache_age_seconds: Optional[float] = None
 
 class BookingUpdate(BaseModel):
     check_in: Optional[str] = Field(None, example="2025-11-18")
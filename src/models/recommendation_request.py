@@ -1,7 +1,17 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import List, Optional
 
 class RecommendationRequest(BaseModel):
     user_id: Optional[str] = None
     query: str
-    preferences: Optional[dict] = None
\ No newline at end of file
+    preferences: Optional[dict] = None
+
+
+class BatchRecommendationItem(BaseModel):
+    query: str
+    user_id: Optional[str] = None
+    limit: int = Field(5, ge=1, le=20)
+
+
+class BatchRecommendationRequest(BaseModel):
+    items: List[BatchRecommendationItem] = Field(..., min_length=1, max_length=100)
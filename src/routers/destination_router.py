@@ -1,11 +1,15 @@
+from typing import List, Optional
+
 from fastapi import APIRouter, HTTPException, Query, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from src.services.destination_service import recommend_destinations, get_user_by_id, create_recommendation, get_past_recommendations, regenerate_recommendation, delete_recommendation
 from src.services.user_service import get_current_user
 
 
+from src.models.recommendation_request import BatchRecommendationRequest
 from src.services.destination_service import (
     recommend_destinations,
+    recommend_destinations_batch,
     get_user_by_id,
     create_recommendation,
     get_past_recommendations,
@@ -24,7 +28,12 @@ security = HTTPBearer()
 def recommend_destinations_api(
     query: str = Query(..., description="Describe what kind of destination you want"),
     limit: int = Query(5, ge=1, le=20),
-    user_id: str = Query(None, description="Optional user ID for personalized results")
+    user_id: str = Query(None, description="Optional user ID for personalized results"),
+    country: Optional[str] = Query(None, description="Only destinations in this country"),
+    tags: Optional[List[str]] = Query(None, description="Only destinations with all of these tags"),
+    min_cost: Optional[float] = Query(None, ge=0, description="Minimum average cost"),
+    max_cost: Optional[float] = Query(None, ge=0, description="Maximum average cost"),
+    month: Optional[int] = Query(None, ge=1, le=12, description="Only destinations worth visiting in this month (1-12)")
 ):
     try:
         user_prefs = {}
@@ -34,13 +43,25 @@ def recommend_destinations_api(
                 raise HTTPException(status_code=404, detail="User not found")
             user_prefs = user.get("preferences", {})
 
-        results = recommend_destinations(query, limit, user_prefs)
+        filters = {"country": country, "tags": tags, "min_cost": min_cost, "max_cost": max_cost, "month": month}
+        results = recommend_destinations(query, limit, user_prefs, filters)
         return {"query": query, "results": results}
     except Exception as e:
         print("Exception is ****** ", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Public: recommendations for many saved queries / users in one call (no DB writes)
+@router.post("/destinations/recommendation/batch")
+def recommend_destinations_batch_api(request: BatchRecommendationRequest):
+    try:
+        results = recommend_destinations_batch([item.model_dump() for item in request.items])
+        return {"results": results}
+    except Exception as e:
+        print("Exception is ****** ", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 # Protected: create + store recommendation
 @router.post("/destinations/recommendations")
 def create_recommendation_api(
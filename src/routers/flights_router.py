@@ -1,9 +1,12 @@
-from fastapi import APIRouter, Query, Depends, Body
+import json
+
+from fastapi import APIRouter, Query, Depends, Body, HTTPException
+from fastapi.responses import StreamingResponse
 
 from config.databse import users_collection
 from src.models.flights_model import FlightsListSearchResponse, FlightInfoResponse, BookFlightResponse, \
     DeleteFlightResponse, UserBookedFlightsResponse, FlightsListSearchRequest, FlightInfoRequest, BookFlightRequest, \
-    DeleteFlightRequest
+    DeleteFlightRequest, FlightCalendarRequest, FlightCalendarResponse, FlightsBatchSearchRequest
 from src.services.user_service import get_current_user
 from src.services.flights_service import FlightsService
 router = APIRouter(prefix="/flights", tags=["flights"])
@@ -21,6 +24,35 @@ async def search_flights(
     # await service.save_flights_list(query,flights, user_id=current_user["_id"])
     await service.save_flights_list( flights=flights, user_id=current_user["_id"])
     return flights
+# Batch search: one NDJSON line per route, sent as soon as that route is priced
+@router.post("/batch")
+async def search_flights_batch(
+        batch_input: FlightsBatchSearchRequest = Body(...),
+        current_user: dict = Depends(get_current_user)
+):
+
+    async def stream():
+        async for result in service.search_flights_batch(batch_input):
+            line = {"index": result["index"], "route": result["route"].dict()}
+            if "error" in result:
+                line["error"] = result["error"]
+            else:
+                line["flights"] = [f.dict() for f in result["flights"]]
+                await service.save_flights_list(flights=result["flights"], user_id=current_user["_id"])
+            yield json.dumps(line, default=str) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+# Flexible dates: cheapest fare per day around the requested departure date
+@router.post("/calendar", response_model=FlightCalendarResponse)
+async def search_flight_calendar(
+        calendar_input: FlightCalendarRequest = Body(...),
+        current_user: dict = Depends(get_current_user)
+):
+    try:
+        return await service.search_flight_calendar(calendar_input)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 # 2nd API Call: Get flight info based on flight number
 @router.post("/flight_number", response_model = FlightInfoResponse)
 async def get_flight_info(flight_input: FlightInfoRequest = Body()):
@@ -32,7 +64,10 @@ async def book_flight(flight_input: BookFlightRequest = Body(...),
                       current_user: dict = Depends(get_current_user)):
     print("HELLO FROM book_flight endpoint")
     if current_user["email"] == flight_input.user_email:
-        return await service.book_flight(flight_input)
+        try:
+            return await service.book_flight(flight_input)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
     else:
         return {"error": "Unauthorized: Email does not match the logged-in user"}
 
@@ -47,10 +82,15 @@ async def cancel_flight(cancel_flight_input: DeleteFlightRequest = Body(...),
 # 5th API Call: get user's booked flights history
 @router.get("/booked_flights_history", response_model=UserBookedFlightsResponse)
 async def get_booking_history(
+        limit: int = Query(20, ge=1, le=100),
+        cursor: str = Query(None, description="next_cursor from the previous page"),
         current_user: dict = Depends(get_current_user)
 ):
     print("HELLO FROM BOOKING HISTORY endpoint")
-    bookings = await service.get_user_booked_flights(current_user=current_user)
+    try:
+        bookings = await service.get_user_booked_flights(current_user=current_user, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return bookings
 
 
@@ -1,13 +1,17 @@
+import asyncio
 import logging
 
 from bson import ObjectId
-from fastapi import APIRouter, HTTPException, Body, Path, Depends
+from typing import Literal, Optional
+
+from fastapi import APIRouter, HTTPException, Body, Path, Depends, Query
 from src.services.nlp_hotel_service import extract_hotel_search_params
 from src.services.user_service import get_current_user
 from config.databse import hotel_bookings_collection
 from src.models.hotel_model import BookingCreate, BookingUpdate, HotelModel
 from src.services.hotel_service import (
     search_hotels,  
+    search_local_hotels,
     get_user_by_id, 
     create_booking_for_user,
     get_bookings_by_user_id,
@@ -18,7 +22,7 @@ router = APIRouter()
 logger = logging.getLogger(__name__)
 
 @router.post("/hotels", tags=["hotels"], response_model=list[HotelModel])
-def hotel_search_with_nlp(
+async def hotel_search_with_nlp(
     user_input: str = Body(
         ...,
         embed=True,
@@ -27,22 +31,44 @@ def hotel_search_with_nlp(
 ,
         current_user: dict = Depends(get_current_user)):
     try:
-        # 1. Extract data using NLP model
-        extracted = extract_hotel_search_params(user_input)
+        # 1. Extract data using NLP model (a blocking LLM call, run in a worker thread)
+        extracted = await asyncio.to_thread(extract_hotel_search_params, user_input)
         if not extracted.get("q"):
             raise HTTPException(status_code=400, detail="Destination not found in user input")
 
         # 2. Call hotel API with structured data
-        hotels = search_hotels(**extracted)
+        hotels = await search_hotels(**extracted)
 
         return hotels
         # return {"input": user_input, "result": extracted}
 
+    except HTTPException:
+        raise
     except Exception as e:
         print("Error in hotels service", e)
         raise HTTPException(status_code=500, detail=str(e))
     
 
+@router.get("/hotels/local", tags=["hotels"], response_model=list[HotelModel])
+def local_hotel_search(
+    city: str = Query(..., example="Montreal"),
+    q: Optional[str] = Query(None, description="Keywords matched against hotel names and descriptions",
+                             example="spa downtown"),
+    min_rating: Optional[float] = Query(None, ge=0, le=5),
+    max_price: Optional[float] = Query(None, gt=0, description="Maximum price per night"),
+    sort: Literal["rating", "price", "relevance"] = "rating",
+    limit: int = Query(20, ge=1, le=100),
+    current_user: dict = Depends(get_current_user)):
+    """Search hotels already fetched for a city, without calling the hotel API."""
+    try:
+        return search_local_hotels(city, q, min_rating, max_price, sort, limit)
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    except Exception as e:
+        print("Error in local hotel search", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/users/{user_id}/hotel-bookings", tags=["hotels"])
 def create_user_booking(
     user_id: str = Path(..., description="MongoDB ObjectId of the user"),
@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+
+from src.utils import metrics
+
+router = APIRouter(tags=["metrics"])
+
+
+# Per-worker counters: cache hits/misses, fast-path usage, ...
+@router.get("/metrics")
+def get_metrics():
+    return {"counters": metrics.snapshot()}
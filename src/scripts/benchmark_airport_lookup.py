@@ -0,0 +1,68 @@
+import sys
+import os
+import time
+import random
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))  # adds project root
+
+from src.utils.airport_resolver import AirportResolver, load_airports
+
+
+def make_typo(text, rng):
+    """
+    One random edit (swap, drop or duplicate a character), like a user typing fast.
+    """
+    if len(text) < 4:
+        return text
+    i = rng.randrange(1, len(text) - 2)
+    kind = rng.choice(("swap", "drop", "double"))
+    if kind == "swap":
+        return text[:i] + text[i + 1] + text[i] + text[i + 2:]
+    if kind == "drop":
+        return text[:i] + text[i + 1:]
+    return text[:i] + text[i] + text[i:]
+
+
+def timed(func, queries, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        results = [func(q) for q in queries]
+    return results, (time.perf_counter() - start) / (repeat * len(queries))
+
+
+def run(queries_count, repeat, seed):
+    rng = random.Random(seed)
+    airports = load_airports()
+
+    start = time.perf_counter()
+    resolver = AirportResolver(airports)
+    build_time = time.perf_counter() - start
+
+    rows = [rng.choice(airports) for _ in range(queries_count)]
+    cases = {
+        "code": [row["iata"].lower() for row in rows],
+        "city": [row["city"] for row in rows],
+        "prefix": [row["city"][:4] for row in rows],
+        "typo": [make_typo(row["city"], rng) for row in rows],
+    }
+    expected_cities = [row["city"] for row in rows]
+
+    print(f"{len(resolver)} airports, {len(resolver.keys)} names, index built in {build_time * 1000:.1f} ms")
+    print(f"{'lookup':>8} {'us/lookup':>10} {'same city':>10}")
+    for name, queries in cases.items():
+        results, latency = timed(resolver.resolve, queries, repeat)
+        correct = sum(
+            1 for iata, city in zip(results, expected_cities)
+            if iata and resolver.get(iata)["city"] == city
+        )
+        print(f"{name:>8} {latency * 1e6:>10.1f} {correct / len(queries):>10.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Latency and accuracy of the bundled airport resolver")
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run(args.queries, args.repeat, args.seed)
@@ -0,0 +1,71 @@
+import sys
+import os
+import time
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))  # adds project root
+
+import numpy as np
+
+from src.utils.vector_index import ExactIndex, IVFIndex
+
+
+def make_catalog(n, dim, clusters, spread, rng):
+    """
+    Synthetic normalized embeddings grouped around topic centers, closer to real
+    destination embeddings than uniform noise.
+    """
+    centers = rng.standard_normal((clusters, dim), dtype=np.float32)
+    vectors = centers[rng.integers(0, clusters, n)] + spread * rng.standard_normal((n, dim), dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors
+
+
+def make_queries(vectors, count, rng):
+    queries = vectors[rng.integers(0, len(vectors), count)]
+    queries = queries + rng.standard_normal(queries.shape, dtype=np.float32) / np.float32(np.sqrt(vectors.shape[1]))
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+    return queries.astype(np.float32)
+
+
+def timed_search(index, queries, k, **kwargs):
+    results = []
+    start = time.perf_counter()
+    for query in queries:
+        ids, _ = index.search(query, k, **kwargs)
+        results.append(ids)
+    return results, (time.perf_counter() - start) / len(queries)
+
+
+def run(n, dim, clusters, spread, k, queries_count, probes):
+    rng = np.random.default_rng(0)
+    vectors = make_catalog(n, dim, clusters, spread, rng)
+    queries = make_queries(vectors, queries_count, rng)
+
+    exact = ExactIndex(vectors)
+    truth, exact_latency = timed_search(exact, queries, k)
+
+    start = time.perf_counter()
+    ivf = IVFIndex(vectors)
+    build_time = time.perf_counter() - start
+
+    print(f"{n} destinations, dim {dim}, {ivf.n_lists} lists, IVF build {build_time:.1f}s")
+    print(f"{'index':>14} {'recall@' + str(k):>10} {'latency (ms)':>13}")
+    print(f"{'exact':>14} {1.0:>10.3f} {exact_latency * 1000:>13.3f}")
+    for n_probe in probes:
+        found, latency = timed_search(ivf, queries, k, n_probe=n_probe)
+        recall = np.mean([len(set(a) & set(b)) / k for a, b in zip(found, truth)])
+        print(f"{'ivf n_probe=' + str(n_probe):>14} {recall:>10.3f} {latency * 1000:>13.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recall vs latency of the IVF index against exact search")
+    parser.add_argument("--n", type=int, default=200_000)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--clusters", type=int, default=500)
+    parser.add_argument("--spread", type=float, default=2.0, help="noise around topic centers (higher is harder)")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--probes", type=int, nargs="+", default=[1, 4, 8, 16, 32, 64])
+    args = parser.parse_args()
+    run(args.n, args.dim, args.clusters, args.spread, args.k, args.queries, args.probes)
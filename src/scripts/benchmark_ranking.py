@@ -0,0 +1,69 @@
+import sys
+import os
+import time
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))  # adds project root
+
+import numpy as np
+
+from src.utils.destination_ranker import DestinationRanker
+
+
+def loop_rank(query_vec, vectors, destinations, limit, budget):
+    """
+    Reference implementation: the per-item Python loop recommend_destinations used
+    before the vectorized engine (cosine + budget penalty, then a full sort).
+    """
+    scored = []
+    for dest_vec, dest in zip(vectors, destinations):
+        score = float(np.dot(query_vec, dest_vec) / (np.linalg.norm(query_vec) * np.linalg.norm(dest_vec)))
+        avg_cost = dest.get("average_cost", 0)
+        if budget and avg_cost:
+            cost_penalty = abs(avg_cost - budget) / budget
+            score *= (1 - 0.3 * cost_penalty)
+        scored.append((score, dest))
+    scored.sort(key=lambda x: x[0], reverse=True)
+    return [dest for _, dest in scored[:limit]]
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run(sizes, dim, limit, budget, repeat):
+    rng = np.random.default_rng(0)
+    print(f"{'destinations':>12} {'loop (ms)':>12} {'numpy (ms)':>12} {'speedup':>9}")
+    for n in sizes:
+        vectors = rng.standard_normal((n, dim), dtype=np.float32)
+        destinations = [{"name": f"dest-{i}", "average_cost": float(c)}
+                        for i, c in enumerate(rng.uniform(500, 3000, n))]
+        query_vec = rng.standard_normal(dim, dtype=np.float32)
+
+        ranker = DestinationRanker(destinations, vectors)
+        loop_time = best_of(lambda: loop_rank(query_vec, vectors, destinations, limit, budget), repeat)
+        numpy_time = best_of(lambda: ranker.rank(query_vec, limit=limit, budget=budget), repeat)
+
+        expected = [d["name"] for d in loop_rank(query_vec, vectors, destinations, limit, budget)]
+        actual = [d["name"] for d in ranker.rank(query_vec, limit=limit, budget=budget)]
+        if expected != actual:
+            print(f"  warning: rankings differ at n={n}: {expected} vs {actual}")
+
+        print(f"{n:>12} {loop_time * 1000:>12.2f} {numpy_time * 1000:>12.2f} {loop_time / numpy_time:>8.1f}x")
+        del ranker, vectors
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the loop ranking with the vectorized DestinationRanker")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 10_000, 100_000])
+    parser.add_argument("--dim", type=int, default=1536, help="embedding size (text-embedding-3-small is 1536)")
+    parser.add_argument("--limit", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=1500.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.sizes, args.dim, args.limit, args.budget, args.repeat)
@@ -0,0 +1,59 @@
+import sys
+import os
+import argparse
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))  # adds project root
+
+from pymongo import UpdateOne
+
+from config.databse import flights_collection, users_collection
+from src.services.flights_service import ensure_flight_indexes
+
+
+def migrate_booked_flights(unset: bool = False, batch_size: int = 1000, dry_run: bool = False):
+    """
+    Copy every booking embedded in Users.booked_flights into flights_collection, tagged
+    with the user's email, so booking history is served from the indexed collection.
+    Bookings already there get user_email and their embedded booking_status; the
+    embedded copy's status is the one cancellations kept up to date.
+    With --unset the embedded arrays are removed once they are copied.
+    """
+    if not dry_run:
+        ensure_flight_indexes()
+
+    users = bookings = 0
+    operations = []
+    for user in users_collection.find({"booked_flights.0": {"$exists": True}}, {"email": 1, "booked_flights": 1}):
+        users += 1
+        for booking in user["booked_flights"]:
+            bookings += 1
+            booking = {**booking, "user_email": user["email"]}
+            booking.setdefault("booked_at", datetime.now())
+            booking_id = booking.pop("_id")
+            operations.append(UpdateOne({"_id": booking_id}, {"$set": booking}, upsert=True))
+            if len(operations) == batch_size:
+                _flush(operations, dry_run)
+                operations = []
+    _flush(operations, dry_run)
+
+    if unset and not dry_run:
+        result = users_collection.update_many(
+            {"booked_flights": {"$exists": True}}, {"$unset": {"booked_flights": ""}}
+        )
+        print(f"Removed embedded booked_flights from {result.modified_count} users.")
+    print(f"{'Would copy' if dry_run else 'Copied'} {bookings} bookings from {users} users.")
+
+
+def _flush(operations: list, dry_run: bool):
+    if operations and not dry_run:
+        flights_collection.bulk_write(operations, ordered=False)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Move Users.booked_flights into the Flights collection")
+    parser.add_argument("--unset", action="store_true", help="remove the embedded arrays after copying")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--dry-run", action="store_true", help="only count what would be copied")
+    args = parser.parse_args()
+    migrate_booked_flights(unset=args.unset, batch_size=args.batch_size, dry_run=args.dry_run)
@@ -0,0 +1,46 @@
+import sys
+import os
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))  # adds project root
+
+from config.databse import destinations_collection
+from src.services.destination_service import EMBEDDING_FIELDS, _backfill_embeddings, _has_fresh_embedding
+
+
+def reindex_destinations(force: bool = False, page_size: int = 2000):
+    """
+    Embed every destination whose stored embedding is missing or stale.
+    Destinations are read page by page and each page is embedded with batched
+    multi-input requests, so the whole collection costs a few dozen API calls.
+    """
+    if force:
+        destinations_collection.update_many({}, {"$unset": {field: "" for field in EMBEDDING_FIELDS}})
+
+    total = embedded = 0
+    page = []
+    for doc in destinations_collection.find({}):
+        doc["_id"] = str(doc["_id"])
+        page.append(doc)
+        if len(page) == page_size:
+            embedded += _reindex_page(page)
+            total += len(page)
+            page = []
+    if page:
+        embedded += _reindex_page(page)
+        total += len(page)
+    print(f"Checked {total} destinations, embedded {embedded}.")
+
+
+def _reindex_page(page: list) -> int:
+    stale = sum(1 for doc in page if not _has_fresh_embedding(doc))
+    _backfill_embeddings(page)
+    return stale
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill or rebuild destination embeddings")
+    parser.add_argument("--force", action="store_true", help="re-embed every destination, not just stale ones")
+    parser.add_argument("--page-size", type=int, default=2000)
+    args = parser.parse_args()
+    reindex_destinations(force=args.force, page_size=args.page_size)
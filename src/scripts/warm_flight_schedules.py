@@ -0,0 +1,23 @@
+import sys
+import os
+import asyncio
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))  # adds project root
+
+from src.services.flights_service import FlightsService, ensure_flight_indexes
+
+
+def warm_flight_schedules(days: int):
+    """
+    One-off (or cron) run of the schedule warm-up the API workers do in the background.
+    """
+    ensure_flight_indexes()
+    asyncio.run(FlightsService().warm_schedule_cache(days))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prefetch flight schedules for upcoming booked flights")
+    parser.add_argument("--days", type=int, default=3, help="bookings departing in the next N days")
+    args = parser.parse_args()
+    warm_flight_schedules(args.days)
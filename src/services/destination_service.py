@@ -1,24 +1,153 @@
 import os
+import re
+import zlib
+import hashlib
+import json
+import threading
+import time
 import numpy as np
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from bson import ObjectId
-from datetime import datetime, timezone
+from datetime import datetime, timezone, timedelta
 from openai import OpenAI
+from pymongo import ASCENDING, DESCENDING
 
 from config.databse import db, users_collection, destinations_collection, recommendations_collection
 from config.settings import settings
+from src.utils import metrics
+from src.utils.bulk_upsert import bulk_upsert
+from src.utils.cache import TTLCache
+from src.utils.destination_ranker import DestinationRanker
 
-# AI model setup (OpenAI embeddings)
-openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY_OTHER"))
-EMBED_MODEL = "text-embedding-3-small"
+OPENAI_EMBED_MODEL = "text-embedding-3-small"
+
+# Words that carry no meaning for the local embedding backend
+STOPWORDS = {
+    "a", "an", "and", "the", "of", "in", "on", "for", "to", "with", "at", "by", "from",
+    "is", "are", "i", "we", "me", "my", "want", "like", "some", "somewhere", "place", "trip",
+}
+
+
+# Embedding providers
+class EmbeddingProvider(ABC):
+    """
+    Turns texts into embedding vectors. `model_name` is stored with destination
+    embeddings, so switching providers re-embeds the catalog.
+    """
+    model_name: str = ""
+    # whether texts get the query / destination prefixes before embedding
+    uses_prefixes: bool = True
+
+    @abstractmethod
+    def embed(self, texts: list) -> list:
+        """Return one vector per text, in order."""
+
+
+class OpenAIEmbeddingProvider(EmbeddingProvider):
+    """
+    Embeddings from the OpenAI API (one request per batch of texts).
+    """
+
+    def __init__(self, model: str = OPENAI_EMBED_MODEL):
+        self.model_name = model
+        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY_OTHER"))
+
+    def embed(self, texts: list) -> list:
+        response = self.client.embeddings.create(
+            model=self.model_name,
+            input=texts
+        )
+        # The API tags each vector with the position of its input
+        ordered = sorted(response.data, key=lambda item: item.index)
+        return [np.array(item.embedding) for item in ordered]
+
+
+class HashingEmbeddingProvider(EmbeddingProvider):
+    """
+    Fully local embeddings: signed feature hashing of words, word bigrams and
+    character trigrams with sublinear term frequency, L2-normalized.
+    Needs no network and no model file, and embeds a text in microseconds.
+    """
+    uses_prefixes = False
+
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+        self.model_name = f"local-hashing-{dim}"
+
+    def embed(self, texts: list) -> list:
+        return [self._embed_one(text) for text in texts]
+
+    def _embed_one(self, text: str) -> np.ndarray:
+        words = [w for w in re.findall(r"[\w']+", text.lower()) if w not in STOPWORDS]
+        features = list(words)
+        features += [f"{a} {b}" for a, b in zip(words, words[1:])]
+        features += [f"#{w[i:i + 3]}" for w in words for i in range(len(w) - 2) if len(w) > 3]
+
+        counts = {}
+        for feature in features:
+            counts[feature] = counts.get(feature, 0) + 1
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for feature, count in counts.items():
+            h = zlib.crc32(feature.encode("utf-8"))
+            sign = 1.0 if (h >> 31) & 1 else -1.0
+            weight = 1.0 + np.log(count)
+            if feature.startswith("#"):
+                weight *= 0.5  # character trigrams only smooth over spelling variants
+            vector[h % self.dim] += sign * weight
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+def get_embedding_provider() -> EmbeddingProvider:
+    """
+    Build the embedding backend selected by EMBEDDING_PROVIDER ("openai" or "local").
+    """
+    if settings.EMBEDDING_PROVIDER == "local":
+        return HashingEmbeddingProvider(settings.LOCAL_EMBEDDING_DIM)
+    if settings.EMBEDDING_PROVIDER != "openai":
+        raise ValueError(f"Unknown embedding provider: {settings.EMBEDDING_PROVIDER}")
+    return OpenAIEmbeddingProvider()
+
+
+# AI model setup (loaded once per worker)
+embedding_provider = get_embedding_provider()
+EMBED_MODEL = embedding_provider.model_name
+
+# Users repeat the same few queries, so their embeddings are cached
+query_embedding_cache = TTLCache(
+    "query_embedding_cache",
+    maxsize=settings.QUERY_CACHE_SIZE,
+    ttl=settings.QUERY_CACHE_TTL,
+    path=settings.QUERY_CACHE_PATH or None,
+)
+
+# In-memory ranking engine over the whole catalog, shared by the requests of this worker.
+# _watermark is the updated_at up to which destination changes have been applied.
+_ranker = None
+_ranker_lock = threading.Lock()
+_refresh_lock = threading.Lock()
+_watermark = None
+_last_refresh = 0.0
+_refresher = None
+
+# Fields stored next to each destination so we only re-embed when its content changes
+EMBEDDING_FIELDS = ("embedding", "embedding_hash", "embedding_model")
+# Sync / write bookkeeping that stays out of the ranker and recommendation results
+BOOKKEEPING_FIELDS = ("version", "updated_at", "deleted", "content_hash")
+# version of every destination in this worker's ranker, to skip changes it already has
+_ranker_versions = {}
 
 
 # Core functions
-def get_all_destinations(limit: int = 100) -> list:
+def get_all_destinations(limit: int = 100, include_embeddings: bool = False) -> list:
     """
-    Retrieve all destinations from the database.
+    Retrieve all (not deleted) destinations from the database.
     Converts ObjectIds to strings for JSON serialization.
+    Stored embeddings are left out unless include_embeddings is True.
     """
-    cursor = destinations_collection.find().limit(limit)
+    projection = None if include_embeddings else {field: 0 for field in EMBEDDING_FIELDS}
+    cursor = destinations_collection.find({"deleted": {"$ne": True}}, projection).limit(limit)
     data = []
     for doc in cursor:
         doc["_id"] = str(doc["_id"])
@@ -26,70 +155,320 @@ def get_all_destinations(limit: int = 100) -> list:
     return data
 
 
-def _embed_text(text: str, is_query: bool = False) -> np.ndarray:
+def _destination_text(dest: dict) -> str:
     """
-    Convert text to vector embeddings using OpenAI.
-    Prefix text slightly differently for queries vs destination docs.
+    Build the text that represents a destination in the embedding space.
     """
-    if is_query:
-        text = "user request: " + text
-    else:
-        text = "destination description: " + text
+    return f"{dest.get('name', '')} {dest.get('description', '')} {' '.join(dest.get('tags', []))}"
 
-    response = openai_client.embeddings.create(
-        model=EMBED_MODEL,
-        input=text
+
+def _content_hash(dest: dict) -> str:
+    """
+    Hash the fields that feed the destination embedding (name, description, tags).
+    """
+    payload = json.dumps(
+        [dest.get("name", ""), dest.get("description", ""), dest.get("tags", [])],
+        ensure_ascii=False,
     )
-    return np.array(response.data[0].embedding)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
 
-def _cosine(a, b):
+def _has_fresh_embedding(dest: dict) -> bool:
     """
-    Compute cosine similarity between two embedding vectors.
+    True when the stored embedding matches the destination content and current model.
     """
-    return float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b)))
+    return (
+        bool(dest.get("embedding"))
+        and dest.get("embedding_model") == EMBED_MODEL
+        and dest.get("embedding_hash") == _content_hash(dest)
+    )
 
 
-def recommend_destinations(query: str, limit: int = 5, user_prefs: dict = None):
+def _embedding_fields(destinations: list) -> list:
     """
-    Recommend destinations based on a text query and optional user preferences.
-    Uses semantic similarity (embedding vectors) for ranking.
+    Embed destinations in batches and return, in order, the fields to store on each document.
+    """
+    vectors = embed_texts([_destination_text(dest) for dest in destinations], is_query=False)
+    return [
+        {
+            "embedding": [float(x) for x in vector],
+            "embedding_hash": _content_hash(dest),
+            "embedding_model": EMBED_MODEL,
+        }
+        for dest, vector in zip(destinations, vectors)
+    ]
+
+
+def _backfill_embeddings(destinations: list) -> list:
     """
-    # Merge user preferences into the query for personalization
+    Embed and persist destinations that were stored without a (current) embedding,
+    e.g. documents written before embeddings were computed at ingest time.
+    """
+    from pymongo import UpdateOne
+    stale = [dest for dest in destinations if not _has_fresh_embedding(dest)]
+    if not stale:
+        return destinations
+
+    ops = []
+    for dest, fields in zip(stale, _embedding_fields(stale)):
+        ops.append(UpdateOne({"_id": ObjectId(dest["_id"])}, {"$set": fields}))
+        dest.update(fields)
+    destinations_collection.bulk_write(ops, ordered=False)
+    return destinations
+
+
+def _prefixed(text: str, is_query: bool) -> str:
+    """
+    Prefix text slightly differently for queries vs destination docs.
+    """
+    if not embedding_provider.uses_prefixes:
+        return text
+    return ("user request: " if is_query else "destination description: ") + text
+
+
+def _embed_batch(texts: list) -> list:
+    """
+    Embed one batch of already-prefixed texts with a single provider call.
+    """
+    return embedding_provider.embed(texts)
+
+
+def embed_texts(texts: list, is_query: bool = False, batch_size: int = None, max_concurrency: int = None) -> list:
+    """
+    Convert many texts to embeddings using multi-input requests.
+    Texts are chunked into batches of `batch_size`, at most `max_concurrency`
+    batches are in flight at once, and vectors are returned in input order.
+    """
+    batch_size = batch_size or settings.EMBED_BATCH_SIZE
+    max_concurrency = max_concurrency or settings.EMBED_MAX_CONCURRENCY
+    prefixed = [_prefixed(text, is_query) for text in texts]
+    batches = [prefixed[i:i + batch_size] for i in range(0, len(prefixed), batch_size)]
+    if not batches:
+        return []
+    if len(batches) == 1:
+        return _embed_batch(batches[0])
+
+    with ThreadPoolExecutor(max_workers=min(max_concurrency, len(batches))) as executor:
+        results = executor.map(_embed_batch, batches)  # map keeps batch order
+        return [vector for batch in results for vector in batch]
+
+
+def _embed_text(text: str, is_query: bool = False) -> np.ndarray:
+    """
+    Convert text to vector embeddings using the configured provider.
+    Prefix text slightly differently for queries vs destination docs.
+    """
+    return _embed_batch([_prefixed(text, is_query)])[0]
+
+
+def _preferences_text(user_prefs: dict = None) -> str:
+    """
+    Turn user preferences into text that is merged into the query for personalization.
+    """
+    prefs_text = ""
     if user_prefs:
-        prefs_text = ""
         if "interests" in user_prefs:
             prefs_text += " " + " ".join(user_prefs["interests"])
         if "budget" in user_prefs:
             prefs_text += f" budget {user_prefs['budget']}"
-        query = query + prefs_text
+    return prefs_text
 
-    query_vec = _embed_text(query, is_query=True)
-    destinations = get_all_destinations(limit=100)
-    scored = []
 
-    for dest in destinations:
-        text = f"{dest.get('name', '')} {dest.get('description', '')} {' '.join(dest.get('tags', []))}"
-        dest_vec = _embed_text(text, is_query=False)
-        score = _cosine(query_vec, dest_vec)
+def _normalize_query(text: str) -> str:
+    return " ".join(text.lower().split())
 
-        # Budget-based adjustment (optional, light influence)
-        avg_cost = dest.get("average_cost", 0)
-        if user_prefs and "budget" in user_prefs and avg_cost:
-            budget = float(user_prefs["budget"])
-            if budget > 0:
-                cost_penalty = abs(avg_cost - budget) / budget
-                score *= (1 - 0.3 * cost_penalty)
 
-        scored.append((score, dest))
+def _query_cache_key(query: str, prefs_text: str = "") -> str:
+    return f"{EMBED_MODEL}|{_normalize_query(query)}|{_normalize_query(prefs_text)}"
 
-    scored.sort(key=lambda x: x[0], reverse=True)
-    result = []
-    for _, dest in scored[:limit]:
-        dest["_id"] = str(dest["_id"])
-        result.append(dest)
 
-    return result
+def _embed_query(query: str, prefs_text: str = "") -> np.ndarray:
+    """
+    Embed a query merged with preference text, going through the query embedding cache.
+    """
+    key = _query_cache_key(query, prefs_text)
+    vector = query_embedding_cache.get(key)
+    if vector is None:
+        vector = _embed_text(_normalize_query(query) + prefs_text, is_query=True)
+        query_embedding_cache.set(key, vector)
+    return vector
+
+
+def recommend_destinations(query: str, limit: int = 5, user_prefs: dict = None, filters: dict = None):
+    """
+    Recommend destinations based on a text query and optional user preferences.
+    Uses semantic similarity (embedding vectors) for ranking.
+    Optional hard filters (country, tags, min_cost, max_cost, month) are applied
+    before scoring, so only matching destinations are ranked.
+    """
+    query_vec = _embed_query(query, _preferences_text(user_prefs))
+    ranker = get_destination_ranker()
+
+    # Budget-based adjustment (optional, light influence)
+    budget = user_prefs.get("budget") if user_prefs else None
+    filters = {k: v for k, v in (filters or {}).items() if v not in (None, "", [])}
+    return ranker.rank(query_vec, limit=limit, budget=budget, filters=filters)
+
+
+def _split_embedding(dest: dict):
+    """
+    Remove the stored embedding and bookkeeping fields from a destination, remember
+    its version for the refresher, and return its vector.
+    """
+    vector = dest.get("embedding")
+    _ranker_versions[dest["_id"]] = dest.get("version")
+    for field in EMBEDDING_FIELDS + BOOKKEEPING_FIELDS:
+        dest.pop(field, None)
+    return vector
+
+
+def recommend_destinations_batch(items: list) -> list:
+    """
+    Recommend destinations for many (query, user_id, limit) items at once.
+    All cache-missing queries are embedded in one batched call, user preferences are
+    loaded with one $in query, and the batch is scored with one matrix-matrix product.
+    Returns one {"query", "user_id", "results"} (or "error") entry per item, in order.
+    """
+    user_ids = {item["user_id"] for item in items if item.get("user_id") and ObjectId.is_valid(item["user_id"])}
+    users = {}
+    if user_ids:
+        cursor = users_collection.find({"_id": {"$in": [ObjectId(u) for u in user_ids]}}, {"preferences": 1})
+        users = {str(user["_id"]): user for user in cursor}
+
+    outputs = [{"query": item["query"], "user_id": item.get("user_id")} for item in items]
+    valid = []
+    for i, item in enumerate(items):
+        user_id = item.get("user_id")
+        if user_id and not ObjectId.is_valid(user_id):
+            outputs[i]["error"] = "Invalid user_id (not a valid ObjectId)"
+        elif user_id and user_id not in users:
+            outputs[i]["error"] = "User not found"
+        else:
+            valid.append(i)
+    if not valid:
+        return outputs
+
+    prefs = {i: users[items[i]["user_id"]].get("preferences", {}) if items[i].get("user_id") else {} for i in valid}
+    vectors = _embed_queries([(items[i]["query"], _preferences_text(prefs[i])) for i in valid])
+    ranked = get_destination_ranker().rank_many(
+        vectors,
+        limits=[items[i].get("limit", 5) for i in valid],
+        budgets=[prefs[i].get("budget") for i in valid],
+    )
+    for i, results in zip(valid, ranked):
+        outputs[i]["results"] = results
+    return outputs
+
+
+def _embed_queries(queries: list) -> list:
+    """
+    Embed (query, prefs_text) pairs through the query cache; all misses go out in one batch.
+    """
+    keys = [_query_cache_key(q, p) for q, p in queries]
+    vectors = [query_embedding_cache.get(key) for key in keys]
+    missing = [i for i, vector in enumerate(vectors) if vector is None]
+    if missing:
+        texts = [_normalize_query(queries[i][0]) + queries[i][1] for i in missing]
+        for i, vector in zip(missing, embed_texts(texts, is_query=True)):
+            query_embedding_cache.set(keys[i], vector)
+            vectors[i] = vector
+    return vectors
+
+
+def _load_ranker() -> DestinationRanker:
+    """
+    Load the whole catalog (no candidate cap) with its embeddings into a ranker.
+    """
+    destinations = _backfill_embeddings(get_all_destinations(limit=0, include_embeddings=True))
+    _ranker_versions.clear()
+    vectors = [_split_embedding(dest) for dest in destinations]
+    return DestinationRanker(
+        destinations,
+        vectors,
+        index_kind=settings.DESTINATION_INDEX,
+        ann_min_size=settings.ANN_MIN_SIZE,
+        n_probe=settings.IVF_N_PROBE,
+    )
+
+
+def get_destination_ranker() -> DestinationRanker:
+    """
+    Return this worker's in-memory ranker, loading the catalog on first use.
+    Later changes are applied incrementally by refresh_destination_ranker; when the
+    background refresher is not running, a due refresh happens here instead.
+    """
+    global _ranker, _watermark
+    with _ranker_lock:
+        if _ranker is None:
+            _watermark = datetime.now(timezone.utc)
+            _ranker = _load_ranker()
+            return _ranker
+    if _refresher is None and time.time() - _last_refresh > settings.DESTINATION_REFRESH_INTERVAL:
+        refresh_destination_ranker()
+    return _ranker
+
+
+def refresh_destination_ranker() -> int:
+    """
+    Apply destination changes since the last watermark (inserts, updates and deletes)
+    to this worker's ranker. Costs one indexed query plus O(changed) work.
+    Returns the number of changes applied.
+    """
+    global _watermark, _last_refresh
+    if _ranker is None:
+        return 0
+    with _refresh_lock:
+        started_at = datetime.now(timezone.utc)
+        # overlap the previous poll a little so writes stamped by a slightly late clock are not missed
+        since = _watermark - timedelta(seconds=settings.DESTINATION_REFRESH_OVERLAP)
+        changes = list(destinations_collection.find({"updated_at": {"$gte": since}}).sort("updated_at", 1))
+
+        applied = 0
+        upserts = []
+        for doc in changes:
+            doc["_id"] = str(doc["_id"])
+            if doc.get("deleted"):
+                _ranker_versions.pop(doc["_id"], None)
+                applied += _ranker.remove(doc["_id"])
+            elif doc["_id"] not in _ranker_versions or _ranker_versions[doc["_id"]] != doc.get("version"):
+                upserts.append(doc)
+        for doc in _backfill_embeddings(upserts):
+            _ranker.upsert(doc, _split_embedding(doc))
+            applied += 1
+
+        if _ranker.needs_rebuild():
+            _ranker.rebuild_index()
+        _watermark = started_at
+        _last_refresh = time.time()
+        return applied
+
+
+def start_destination_refresher():
+    """
+    Start the background thread that keeps this worker's ranker in sync with the
+    Destinations collection, polling every DESTINATION_REFRESH_INTERVAL seconds.
+    """
+    global _refresher
+
+    def poll():
+        while True:
+            time.sleep(settings.DESTINATION_REFRESH_INTERVAL)
+            try:
+                refresh_destination_ranker()
+            except Exception as e:
+                print("Error refreshing destinations index:", e)
+
+    if _refresher is None:
+        _refresher = threading.Thread(target=poll, name="destination-refresher", daemon=True)
+        _refresher.start()
+
+
+def ensure_destination_indexes():
+    destinations_collection.create_index([("updated_at", ASCENDING)])
+    destinations_collection.create_index([("name", ASCENDING), ("country", ASCENDING)])
+    recommendations_collection.create_index(
+        [("user_id", ASCENDING), ("query_fingerprint", ASCENDING), ("created_at", DESCENDING)]
+    )
 
 
 # DB operations and recommendation history
@@ -108,41 +487,133 @@ def get_user_by_id(user_id: str) -> dict:
     return user
 
 
-def upsert_destinations(destinations: list):
+def upsert_destinations(destinations: list) -> dict:
     """
     Upsert multiple destination documents into MongoDB.
-    Similar to hotel upserts.
+    Similar to hotel upserts: unchanged destinations are skipped, so their
+    version and updated_at only move when something was actually written.
+    Embeddings are computed here, and only for destinations whose name,
+    description or tags changed since they were last embedded.
+    Returns the inserted / modified / skipped counts.
     """
-    from pymongo import UpdateOne
-    ops = []
-    for d in destinations:
-        if not d.get("name"):
-            continue
-        ops.append(
-            UpdateOne(
-                {"name": d["name"], "country": d.get("country")},
-                {
-                    "$set": d,
-                    "$setOnInsert": {
-                        "created_at": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
-                    },
-                },
-                upsert=True,
-            )
+    destinations = [d for d in destinations if d.get("name")]
+    stored = {}
+    if destinations:
+        cursor = destinations_collection.find(
+            {"name": {"$in": [d["name"] for d in destinations]}},
+            {"name": 1, "country": 1, "embedding_hash": 1, "embedding_model": 1},
         )
-    if ops:
-        destinations_collection.bulk_write(ops)
+        stored = {(doc["name"], doc.get("country")): doc for doc in cursor}
+
+    destinations = [
+        {k: v for k, v in d.items() if k not in EMBEDDING_FIELDS + BOOKKEEPING_FIELDS and k != "_id"}
+        for d in destinations
+    ]
+    changed = []
+    for d in destinations:
+        existing = stored.get((d["name"], d.get("country")), {})
+        if existing.get("embedding_model") != EMBED_MODEL or existing.get("embedding_hash") != _content_hash(d):
+            changed.append(d)
+        else:
+            # keep the embedding markers in the document so its content hash stays stable
+            d["embedding_hash"] = existing["embedding_hash"]
+            d["embedding_model"] = existing["embedding_model"]
+    for d, fields in zip(changed, _embedding_fields(changed)):
+        d.update(fields)
+
+    now = datetime.now(timezone.utc)
+    counts = bulk_upsert(
+        destinations_collection,
+        # updated_at is the watermark workers poll to refresh their index
+        [{**d, "country": d.get("country"), "deleted": False, "updated_at": now} for d in destinations],
+        ["name", "country"],
+        set_on_insert={"created_at": now.strftime("%Y-%m-%d %H:%M:%S")},
+        changed_update={"$inc": {"version": 1}},
+        # tombstones are always rewritten so they come back to life
+        current_filter={"deleted": {"$ne": True}},
+        exclude_from_hash=("embedding", "updated_at"),
+    )
+    if counts["inserted"] or counts["modified"]:
+        refresh_destination_ranker()
+    return counts
+
+
+def delete_destinations(query: dict) -> int:
+    """
+    Soft-delete the destinations matching `query`. They stay in the collection
+    as tombstones so every worker's refresher can drop them from its index.
+    """
+    result = destinations_collection.update_many(
+        {**query, "deleted": {"$ne": True}},
+        {
+            "$set": {"deleted": True, "updated_at": datetime.now(timezone.utc)},
+            "$inc": {"version": 1},
+        },
+    )
+    refresh_destination_ranker()
+    return result.modified_count
+
+
+def _query_fingerprint(query: str, user_prefs: dict, limit: int) -> str:
+    """
+    Hash of everything that decides a stored recommendation's results besides the catalog.
+    """
+    payload = json.dumps(
+        {"query": _normalize_query(query), "preferences": user_prefs or {}, "limit": limit},
+        sort_keys=True, default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _catalog_version():
+    """
+    Latest destination change (upserts and soft-deletes both bump updated_at), or None.
+    """
+    latest = destinations_collection.find_one({}, {"updated_at": 1}, sort=[("updated_at", DESCENDING)])
+    if not latest or not latest.get("updated_at"):
+        return None
+    return latest["updated_at"].isoformat() if isinstance(latest["updated_at"], datetime) else str(latest["updated_at"])
+
+
+def _find_reusable_recommendation(user_id: str, fingerprint: str, catalog_version):
+    """
+    Most recent stored recommendation for the same user, query and preferences that was
+    computed against the current catalog inside the reuse window.
+    """
+    if settings.RECOMMENDATION_REUSE_WINDOW <= 0:
+        return None
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.RECOMMENDATION_REUSE_WINDOW)
+    rec = recommendations_collection.find_one(
+        {
+            "user_id": user_id,
+            "query_fingerprint": fingerprint,
+            "created_at": {"$gte": cutoff.isoformat()},
+            "catalog_version": catalog_version,
+        },
+        sort=[("created_at", DESCENDING)],
+    )
+    metrics.increment("recommendations.reuse_hits" if rec else "recommendations.reuse_misses")
+    return rec
 
 
 def create_recommendation(user_id: str, query: str, limit: int = 5):
     user = get_user_by_id(user_id)
     user_prefs = user.get("preferences", {}) if user else {}
 
+    fingerprint = _query_fingerprint(query, user_prefs, limit)
+    catalog_version = _catalog_version()
+    existing = _find_reusable_recommendation(user_id, fingerprint, catalog_version)
+    if existing:
+        existing["_id"] = str(existing["_id"])
+        return existing
+
     results = recommend_destinations(query, limit, user_prefs)
 
     doc = {
         "user_id": user_id,
         "original_query": query,
+        "query_fingerprint": fingerprint,
+        "catalog_version": catalog_version,
         "results": results,
         "created_at": datetime.now(timezone.utc).isoformat(),
         "updated_at": datetime.now(timezone.utc).isoformat(),
@@ -174,14 +645,26 @@ def regenerate_recommendation(rec_id: str, new_query: str, limit: int = 5):
     user = get_user_by_id(user_id)
     user_prefs = user.get("preferences", {}) if user else {}
 
-    # Generate new results based on edited query
-    results = recommend_destinations(new_query, limit, user_prefs)
+    fingerprint = _query_fingerprint(new_query, user_prefs, limit)
+    catalog_version = _catalog_version()
+    existing = _find_reusable_recommendation(user_id, fingerprint, catalog_version)
+    if existing and existing["_id"] == rec["_id"]:
+        rec["_id"] = str(rec["_id"])
+        return rec
+
+    # Generate new results based on edited query, unless an identical one was just computed
+    if existing:
+        results = existing["results"]
+    else:
+        results = recommend_destinations(new_query, limit, user_prefs)
 
     recommendations_collection.update_one(
         {"_id": ObjectId(rec_id)},
         {
             "$set": {
                 "original_query": new_query,
+                "query_fingerprint": fingerprint,
+                "catalog_version": catalog_version,
                 "results": results,
                 "updated_at": datetime.now(timezone.utc).isoformat(),
             }
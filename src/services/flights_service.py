@@ -1,60 +1,218 @@
-import os
+import asyncio
+import base64
+import hashlib
+import json
+import threading
+import time
 import uuid
 
-from datetime import datetime
-from typing import Union, List
+from datetime import datetime, timezone, timedelta
+from typing import Union, List, Optional
 
 from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, UpdateOne
 from dotenv import load_dotenv
 from fastapi import Depends
 
-from config.databse import flights_collection, users_collection
+from config.databse import flights_collection, users_collection, flight_offers_cache_collection, \
+    flight_schedules_collection
+from config.settings import settings
 from src.models.flights_model import BookFlightResponse, Itinerary
 
 from src.models.flights_model import (
     FlightsListSearchRequest,
     FlightsListSearchResponse,
+    FlightCalendarRequest,
+    FlightsBatchSearchRequest,
+    FlightCalendarDay,
+    FlightCalendarResponse,
     FlightInfoResponse,
     FlightInfoRequest, Price, Flight, DeleteFlightResponse, UserBookedFlightsResponse, BookFlightRequest,
     DeleteFlightRequest,
 )
-from amadeus import Client, ResponseError
+from amadeus import ResponseError
 
 from src.services.user_service import get_current_user
 # from src.services import get_current_user
+from src.utils import metrics
+from src.utils.amadeus_session import get_amadeus_client, get_async_amadeus
+from src.utils.cache import TTLCache
 from src.utils.flights_parser import FlightQueryParser
 
 load_dotenv()
-amadeus_client_id = os.getenv("AMADEUS_CLIENT_ID")
-amadeus_client_secret = os.getenv("AMADEUS_CLIENT_SECRET")
+
+# L1 in front of the flight_offers_cache collection, keyed on the Amadeus search params
+flight_offers_cache = TTLCache("flight_offers_cache", maxsize=settings.FLIGHT_CACHE_SIZE, ttl=settings.FLIGHT_CACHE_TTL)
+
+
+# L1 in front of the flight_schedules collection, keyed on carrier|flight number|date
+flight_schedules_cache = TTLCache("flight_schedules_cache", maxsize=2048, ttl=settings.FLIGHT_SCHEDULE_TTL)
+_schedule_warmer = None
+
+
+def _schedule_ttl(departure_date: str) -> int:
+    """
+    Schedules rarely change, except close to departure: re-check those more often.
+    """
+    days_ahead = (datetime.strptime(departure_date, "%Y-%m-%d").date() - datetime.now().date()).days
+    return settings.FLIGHT_SCHEDULE_TTL_NEAR if days_ahead <= 1 else settings.FLIGHT_SCHEDULE_TTL
+
+
+def _offers_cache_key(params: dict) -> str:
+    return hashlib.sha256(json.dumps(params, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def _offer_id(cache_key: str, item: dict, itinerary: dict) -> str:
+    """
+    Stable id for one searched itinerary: the same search returning the same flights at the
+    same price gets the same id, so repeated searches refresh one stored offer.
+    """
+    payload = json.dumps(
+        {
+            "search": cache_key,
+            "segments": [
+                [s["carrierCode"], s["number"], s["departure"]["at"]] for s in itinerary.get("segments", [])
+            ],
+            "price": item.get("price", {}),
+        },
+        sort_keys=True, default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:24]
+
+
+def ensure_flight_indexes():
+    # MongoDB drops cached offers once expires_at has passed
+    flight_offers_cache_collection.create_index("expires_at", expireAfterSeconds=0)
+    # Bookable offers expire the same way; bookings have no expires_at and are never dropped
+    flights_collection.create_index("expires_at", expireAfterSeconds=0)
+    flight_schedules_collection.create_index("expires_at", expireAfterSeconds=0)
+    # Schedule warm-up: confirmed bookings departing soon
+    flights_collection.create_index([("booking_status", ASCENDING), ("departure_time", ASCENDING)])
+    # Booking history: a user's bookings with one status, newest first
+    flights_collection.create_index(
+        [("user_email", ASCENDING), ("booking_status", ASCENDING), ("booked_at", DESCENDING), ("_id", DESCENDING)]
+    )
+
+
+# Only what _booking_response needs is read for booking history
+BOOKING_RESPONSE_FIELDS = [
+    "flight", "departure_airport", "arrival_airport", "departure_time", "arrival_time",
+    "carrier_code", "duration", "segments", "price", "booking_status", "booked_at",
+]
+
+
+def _encode_cursor(booking: dict) -> str:
+    raw = f"{booking['booked_at'].isoformat()}|{booking['_id']}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str):
+    try:
+        booked_at, booking_id = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").split("|", 1)
+        return datetime.fromisoformat(booked_at), booking_id
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
 
 
 class FlightsService:
     def __init__(self):
-        self.amadeus = Client(
-            client_id=amadeus_client_id,
-            client_secret=amadeus_client_secret,
-        )
+        # one client and OAuth token per process (the token itself is shared across workers)
+        self.amadeus = get_amadeus_client()
+        self.amadeus_async = get_async_amadeus()
         self.parser = FlightQueryParser()
 
     async def search_flights_list(self, flight_request_raw: FlightsListSearchRequest) -> list[FlightsListSearchResponse]:
 
-        flight_request = self.parser.normalize_flight_input(flight_request_raw.dict())
+        # the normalizer calls the LLM synchronously, keep it off the event loop
+        flight_request = await asyncio.to_thread(self.parser.normalize_flight_input, flight_request_raw.dict())
         print(flight_request)
-        # Make the API request to Amadeus
-        print("Sending request to Amadeus API with parameters:")
-        print({
-            "originLocationCode": flight_request.departure_airport,
-            "destinationLocationCode": flight_request.arrival_airport,
-            "departureDate": str(flight_request.departure_date),
-            "adults": flight_request.adults,
-            "children": flight_request.children,
-            "infants": flight_request.infants,
-            "travelClass": flight_request.cabin_class.upper(),
-            "currencyCode": flight_request.currency,
-            "includedAirlineCodes" : flight_request.airline,
-        })
+        return await self._search_normalized(flight_request)
+
+    async def search_flights_batch(self, batch_request: FlightsBatchSearchRequest):
+        """
+        Async generator yielding {"index", "route", "flights"} (or "error") per route as soon as
+        that route's search completes. All routes are normalized together, and the searches
+        share the Amadeus thread pool, which caps upstream concurrency for the whole process.
+        """
+        raw_fields_list = [route.dict() for route in batch_request.routes]
+        flight_requests = await asyncio.to_thread(self.parser.normalize_flight_inputs, raw_fields_list)
+
+        async def search(index, flight_request):
+            try:
+                return {
+                    "index": index,
+                    "route": flight_request,
+                    "flights": await self._search_normalized(flight_request),
+                }
+            except Exception as e:
+                print("Error in batch flight search:", e)
+                return {"index": index, "route": flight_request, "error": str(e)}
+
+        tasks = [asyncio.create_task(search(i, r)) for i, r in enumerate(flight_requests)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # the client went away: don't keep searching for nobody
+            for task in tasks:
+                task.cancel()
+
+    async def search_flight_calendar(self, calendar_request: FlightCalendarRequest) -> FlightCalendarResponse:
+        """
+        Cheapest fare per day for departure_date +/- flex_days. The input is normalized once,
+        then one search per day runs with at most FLIGHT_CALENDAR_CONCURRENCY in flight;
+        days already in the flight offer cache don't reach Amadeus.
+        """
+        raw_fields = calendar_request.dict(exclude={"flex_days"})
+        flight_request = await asyncio.to_thread(self.parser.normalize_flight_input, raw_fields)
+        center = datetime.strptime(flight_request.departure_date, "%Y-%m-%d").date()
+        today = datetime.now().date()
+        dates = [
+            center + timedelta(days=offset)
+            for offset in range(-calendar_request.flex_days, calendar_request.flex_days + 1)
+            if center + timedelta(days=offset) >= today
+        ]
+
+        semaphore = asyncio.Semaphore(settings.FLIGHT_CALENDAR_CONCURRENCY)
+
+        async def cheapest_on(day) -> FlightCalendarDay:
+            day_request = flight_request.model_copy(update={"departure_date": day.isoformat()})
+            async with semaphore:
+                flights = await self._search_normalized(day_request)
+            if not flights:
+                return FlightCalendarDay(date=day.isoformat())
+            cheapest = min(flights, key=lambda f: float(f.price))
+            return FlightCalendarDay(
+                date=day.isoformat(),
+                price=cheapest.price,
+                flight_number=cheapest.flight_number,
+                offer_id=cheapest.offer_id,
+                cache_age_seconds=cheapest.cache_age_seconds,
+            )
+
+        days = await asyncio.gather(*[cheapest_on(day) for day in dates])
+        return FlightCalendarResponse(
+            departure_airport=flight_request.departure_airport,
+            arrival_airport=flight_request.arrival_airport,
+            cabin_class=flight_request.cabin_class,
+            currency=flight_request.currency,
+            days=days,
+        )
+
+    async def _search_normalized(self, flight_request: FlightsListSearchRequest) -> list[FlightsListSearchResponse]:
+        params = self._build_offer_params(flight_request)
+
+        try:
+            flight_data, cache_age = await self._fetch_flight_offers(params)
+        except ResponseError as error:
+            print("Error in the Amadeus API request:", error)
+            return []
 
+        flights, offers = self._parse_flight_offers(flight_data, flight_request, _offers_cache_key(params), cache_age)
+        await self._save_offers(offers)
+        return flights
+
+    def _build_offer_params(self, flight_request: FlightsListSearchRequest) -> dict:
         params = {
             "originLocationCode": flight_request.departure_airport,
             "destinationLocationCode": flight_request.arrival_airport,
@@ -70,16 +228,57 @@ class FlightsService:
         # include only if the user has specified their prefered airline
         if flight_request.airline:
             params["includedAirlineCodes"] = flight_request.airline
+        return params
+
+    async def _fetch_flight_offers(self, params: dict):
+        """
+        Return (offers, age in seconds) for the Amadeus search `params`, checking the
+        in-process cache, then the MongoDB cache, before calling Amadeus.
+        """
+        key = _offers_cache_key(params)
+        now = datetime.now(timezone.utc)
+        # the in-process entry keeps the original fetch time so a copy from MongoDB reports its real age
+        cached = flight_offers_cache.get(key)
+        if cached is not None:
+            fetched_at, flight_data = cached
+            return flight_data, (now - fetched_at).total_seconds()
+
+        cached = await asyncio.to_thread(
+            flight_offers_cache_collection.find_one, {"_id": key, "expires_at": {"$gt": now}}
+        )
+        if cached:
+            metrics.increment("flight_offers_cache.mongo_hits")
+            fetched_at = cached["fetched_at"].replace(tzinfo=timezone.utc)
+            expires_at = cached["expires_at"].replace(tzinfo=timezone.utc)
+            flight_offers_cache.set(key, (fetched_at, cached["offers"]), ttl=(expires_at - now).total_seconds())
+            return cached["offers"], (now - fetched_at).total_seconds()
 
-        try:
-            response = self.amadeus.shopping.flight_offers_search.get(**params)
-            flight_data = response.data
-        except ResponseError as error:
-            print("Error in the Amadeus API request:", error)
-            return []
+        print("Sending request to Amadeus API with parameters:")
+        print(params)
+        response = await self.amadeus_async.flight_offers_search(**params)
+        flight_data = response.data
+        flight_offers_cache.set(key, (now, flight_data))
+        await asyncio.to_thread(
+            flight_offers_cache_collection.replace_one,
+            {"_id": key},
+            {
+                "params": params,
+                "offers": flight_data,
+                "fetched_at": now,
+                "expires_at": now + timedelta(seconds=settings.FLIGHT_CACHE_TTL),
+            },
+            upsert=True,
+        )
+        return flight_data, 0.0
 
+    def _parse_flight_offers(self, flight_data: list, flight_request: FlightsListSearchRequest, cache_key: str,
+                             cache_age: float = None):
+        """
+        Return (search results, bookable offer documents), one of each per itinerary.
+        """
         # Define the response parsing logic
         flights = []
+        offers = []
         for item in flight_data:
             itineraries = item["itineraries"]
             for itinerary in itineraries:
@@ -95,7 +294,9 @@ class FlightsService:
                         "arrival_time": segment["arrival"]["at"],
                     })
 
+                offer_id = _offer_id(cache_key, item, itinerary)
                 flight = FlightsListSearchResponse(
+                    offer_id=offer_id,
                     flight_number=" -> ".join([s["flight_number"] for s in segment_info]),
                     airline=", ".join([s["airline"] for s in segment_info]),
                     departure_airport=segment_info[0]["departure_airport"],
@@ -106,9 +307,58 @@ class FlightsService:
                     duration=total_duration,
                     price=item["price"]["total"],
                     cabin_class=flight_request.cabin_class.upper(),
+                    cache_age_seconds=cache_age,
                 )
                 flights.append(flight)
-        return flights
+                offers.append({
+                    "_id": offer_id,
+                    "doc_type": "flight_offer",
+                    "flight": flight.flight_number,
+                    "departure_airport": flight.departure_airport,
+                    "arrival_airport": flight.arrival_airport,
+                    "departure_time": flight.departure_time,
+                    "arrival_time": flight.arrival_time,
+                    "carrier_code": flight.airline,
+                    "duration": flight.duration,
+                    "cabin_class": flight_request.cabin_class.upper(),
+                    "segments": [
+                        {
+                            "flight_number": s["flight_number"],
+                            "carrier_code": s["airline"],
+                            "departure_airport": s["departure_airport"],
+                            "arrival_airport": s["arrival_airport"],
+                            "departure_time": s["departure_time"],
+                            "arrival_time": s["arrival_time"],
+                            "duration": None,
+                        }
+                        for s in segment_info
+                    ],
+                    "price": {
+                        "total": item["price"]["total"],
+                        "currency": item["price"].get("currency", flight_request.currency),
+                        "grand_total": item["price"].get("grandTotal", item["price"]["total"]),
+                    },
+                })
+        return flights, offers
+
+    async def _save_offers(self, offers: list):
+        """
+        Store searched offers in flights_collection so they can be booked by id until they expire.
+        """
+        if not offers:
+            return
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=settings.FLIGHT_OFFER_TTL)
+        operations = [
+            UpdateOne({"_id": offer["_id"]}, {"$set": {**offer, "expires_at": expires_at}}, upsert=True)
+            for offer in offers
+        ]
+        await asyncio.to_thread(flights_collection.bulk_write, operations, ordered=False)
+
+    async def _get_offer(self, offer_id: str) -> Optional[dict]:
+        return await asyncio.to_thread(
+            flights_collection.find_one,
+            {"_id": offer_id, "doc_type": "flight_offer", "expires_at": {"$gt": datetime.now(timezone.utc)}},
+        )
 
     async def search_flight_info(self, flight_info_request: FlightInfoRequest) -> Union[FlightInfoResponse, dict]:
 
@@ -120,21 +370,10 @@ class FlightsService:
             return {"error": "Invalid date format. Please use YYYY-MM-DD."}
 
 
-        # Make the API call to Amadeus
-        print("Sending request to Amadeus API with parameters:")
-        print({
-            "carrierCode": flight_info_request.airline,
-            "flightNumber": flight_info_request.flight_number,
-            "scheduledDepartureDate": flight_info_request.departure_date,
-
-        })
         try:
-            response = self.amadeus.schedule.flights.get(
-                carrierCode=flight_info_request.airline,
-                flightNumber=flight_info_request.flight_number,
-                scheduledDepartureDate=flight_info_request.departure_date,
+            flight_data = await self._fetch_schedule(
+                flight_info_request.airline, flight_info_request.flight_number, flight_info_request.departure_date
             )
-            flight_data = response.data
         except ResponseError as error:
             print("Error in the Amadeus API request:", error)
             return []
@@ -159,6 +398,79 @@ class FlightsService:
             gate_arrival= "Not assigned yet",
         )
         return flight
+    async def _fetch_schedule(self, carrier: str, flight_number: str, departure_date: str) -> list:
+        """
+        Amadeus schedule data for one flight on one date: in-process cache, then the
+        flight_schedules collection, then Amadeus. Only non-empty schedules are cached.
+        """
+        carrier, flight_number = carrier.upper(), str(flight_number)
+        key = f"{carrier}|{flight_number}|{departure_date}"
+        flight_data = flight_schedules_cache.get(key)
+        if flight_data is not None:
+            return flight_data
+
+        now = datetime.now(timezone.utc)
+        cached = await asyncio.to_thread(
+            flight_schedules_collection.find_one, {"_id": key, "expires_at": {"$gt": now}}
+        )
+        if cached:
+            metrics.increment("flight_schedules_cache.mongo_hits")
+            expires_at = cached["expires_at"].replace(tzinfo=timezone.utc)
+            flight_schedules_cache.set(key, cached["schedule"], ttl=(expires_at - now).total_seconds())
+            return cached["schedule"]
+
+        # Make the API call to Amadeus
+        print("Sending request to Amadeus API with parameters:")
+        print({"carrierCode": carrier, "flightNumber": flight_number, "scheduledDepartureDate": departure_date})
+        response = await self.amadeus_async.schedule_flights(
+            carrierCode=carrier,
+            flightNumber=flight_number,
+            scheduledDepartureDate=departure_date,
+        )
+        flight_data = response.data
+        if flight_data:
+            ttl = _schedule_ttl(departure_date)
+            flight_schedules_cache.set(key, flight_data, ttl=ttl)
+            await asyncio.to_thread(
+                flight_schedules_collection.replace_one,
+                {"_id": key},
+                {"schedule": flight_data, "fetched_at": now, "expires_at": now + timedelta(seconds=ttl)},
+                upsert=True,
+            )
+        return flight_data
+
+    async def warm_schedule_cache(self, days: int = None) -> int:
+        """
+        Prefetch schedules of every segment of confirmed bookings departing in the next
+        `days` days, so their flight status is served from local data. Returns how many
+        (carrier, flight number, date) schedules were checked.
+        """
+        days = settings.FLIGHT_SCHEDULE_WARM_DAYS if days is None else days
+        start = datetime.now().date()
+        end = start + timedelta(days=days)
+        bookings = await asyncio.to_thread(
+            lambda: list(flights_collection.find(
+                {"booking_status": "Confirmed", "departure_time": {"$gte": start.isoformat(), "$lt": end.isoformat()}},
+                {"segments": 1, "flight": 1, "carrier_code": 1, "departure_time": 1},
+            ))
+        )
+
+        flights = set()
+        for booking in bookings:
+            for carrier, number, date in _booked_segments(booking):
+                if start.isoformat() <= date < end.isoformat():
+                    flights.add((carrier, number, date))
+
+        async def warm(flight):
+            try:
+                await self._fetch_schedule(*flight)
+            except Exception as e:
+                print("Could not prefetch schedule for", flight, e)
+
+        await asyncio.gather(*[warm(flight) for flight in flights])
+        print(f"Warmed schedules for {len(flights)} booked flights")
+        return len(flights)
+
     # Save flight search list in the databse
     async def save_flights_list(self, flights: List[dict], user_id: str):
         document = {
@@ -175,81 +487,71 @@ class FlightsService:
         user = users_collection.find_one({"email": flight_input.user_email})
         if not user:
             raise ValueError("User not found")
-        search_input = FlightsListSearchRequest(
-            departure_airport= flight_input.departure_airport,
-            arrival_airport= flight_input.arrival_airport,
-            departure_date= flight_input.departure_date,
-            cabin_class= flight_input.cabin_class,
-            currency= flight_input.currency,
-            adults= flight_input.adults,
-            children= flight_input.children,
-            infants= flight_input.infants,
-        )
-        # search for flights using the function search flight lists
-        flights_list = await self.search_flights_list(search_input)
-        # handle the case where no flights were found in the flights list with the user's preferences
-        if not flights_list:
+
+        if flight_input.offer_id:
+            # the offer was stored by the search that returned it, no second search is needed
+            offer = await self._get_offer(flight_input.offer_id)
+        else:
+            offer = await self._find_offer_by_search(flight_input)
+
+        # handle the case where the offer expired or the requested flight is not offered anymore
+        if not offer:
             return BookFlightResponse(
                 booking_id = str(uuid.uuid4()),
                 booking_status = "Failed",
                 itineraries=[],
-                price=Price(total="0", currency="CAD", grand_total= "0.0")
+                price=Price(total="0", currency=flight_input.currency or "CAD", grand_total= "0.0")
             )
-        selected_flight = next((f for f in flights_list if f.flight_number == flight_input.flight_number),
-                               flights_list[0])
 
-        print("This is the selected flight", selected_flight)
+        print("This is the selected offer", offer["_id"])
         # Book the flight, i.e add the flight to the flights colletion in the database
         booking_id = str(uuid.uuid4())
         booking_doc = {
             "_id": booking_id,
-            "flight": selected_flight.flight_number,
-            "departure_airport": selected_flight.departure_airport,
-            "arrival_airport": selected_flight.arrival_airport,
-            "departure_time": selected_flight.departure_time,
-            "arrival_time": selected_flight.arrival_time,
+            "user_email": flight_input.user_email,
+            "offer_id": offer["_id"],
+            "flight": offer["flight"],
+            "departure_airport": offer["departure_airport"],
+            "arrival_airport": offer["arrival_airport"],
+            "departure_time": offer["departure_time"],
+            "arrival_time": offer["arrival_time"],
             "booking_status": "Confirmed",
-            "carrier_code": selected_flight.airline,
-            "duration": selected_flight.duration,
-            "price": {
-                "total": selected_flight.price,
-                "currency": "CAD",
-                "grand_total": selected_flight.price,
-        },
+            "carrier_code": offer["carrier_code"],
+            "duration": offer["duration"],
+            "segments": offer["segments"],
+            "price": offer["price"],
             "booked_at": datetime.now(),
         }
-        # Insert the booking document into the flights collection
+        # Insert the booking document into the flights collection, where the booking history is read from
         flights_collection.insert_one(booking_doc)
         print("Flight booked successfully with booking ID:", booking_id)
-        # Insert the flight booking into the user's booked flights list
-        users_collection.update_one({
-            "email": flight_input.user_email,
-        }, {
-            "$push": { "booked_flights": booking_doc}},
-        )
         # Prepare the response
-        flight = Flight(
-            flight_number=selected_flight.flight_number,
-            departure_airport=selected_flight.departure_airport,
-            arrival_airport=selected_flight.arrival_airport,
-            departure_time=selected_flight.departure_time,
-            arrival_time=selected_flight.arrival_time,
-            duration=selected_flight.duration,
-            carrier_code=selected_flight.airline,
-        )
-        itinerary = Itinerary(segments=[flight])
-        price = Price(
-            total=selected_flight.price,
-            currency="CAD",
-            grand_total=selected_flight.price,
-        )
-        booking_response = BookFlightResponse(
-            booking_id=booking_id,
-            booking_status="Confirmed",
-            itineraries=[itinerary],
-            price=price,
+        return _booking_response(booking_doc)
+
+    async def _find_offer_by_search(self, flight_input: BookFlightRequest) -> Optional[dict]:
+        """
+        Older clients book by flight number: search again and take the offer with exactly
+        that flight number, never a different flight.
+        """
+        if not (flight_input.flight_number and flight_input.departure_airport
+                and flight_input.arrival_airport and flight_input.departure_date):
+            raise ValueError("offer_id or flight_number, departure_airport, arrival_airport and departure_date are required")
+        search_input = FlightsListSearchRequest(
+            departure_airport= flight_input.departure_airport,
+            arrival_airport= flight_input.arrival_airport,
+            departure_date= flight_input.departure_date,
+            cabin_class= flight_input.cabin_class,
+            currency= flight_input.currency,
+            adults= flight_input.adults,
+            children= flight_input.children,
+            infants= flight_input.infants,
         )
-        return booking_response
+        # search for flights using the function search flight lists
+        flights_list = await self.search_flights_list(search_input)
+        selected_flight = next((f for f in flights_list if f.flight_number == flight_input.flight_number), None)
+        if not selected_flight:
+            return None
+        return await self._get_offer(selected_flight.offer_id)
 
     # Delete a booked flight
     async def cancel_flight(self, cancel_input: DeleteFlightRequest, current_user:dict) -> DeleteFlightResponse:
@@ -263,29 +565,17 @@ class FlightsService:
                 refund_amount="None",
             )
         # Delete the booking
-        db_query = {"_id": booking_id}
-        booking = flights_collection.find_one(db_query)
-        user = users_collection.find_one({
-            "email": current_user['email'],
-            "booked_flights._id": booking_id})
         # Make sure that the booking belongs to the user
-        if not user:
+        db_query = {"_id": booking_id, "user_email": current_user['email']}
+        booking = flights_collection.find_one(db_query, {"price": 1})
+        if not booking:
             raise ValueError("You are not authorized to cancel this booking")
-        flights_collection.update_one(
-            {"_id": booking_id},
+        result = flights_collection.update_one(
+            db_query,
             {"$set": {"booking_status": "Cancelled"}}
         )
-        # Also remove the booking from the user's booked flights list
-        result = users_collection.update_one({
-            "email": current_user['email'],
-            "booked_flights._id": booking_id,
-        }, {
-            "$set": {"booked_flights.$.booking_status": "Cancelled"}
-        },
-        )
 
         print("Matched:", result.matched_count, "Modified:", result.modified_count)
-        print(users_collection.find_one({"email": current_user['email']})["booked_flights"])
 
         # Prepare the response
         refund_price = Price(
@@ -299,44 +589,84 @@ class FlightsService:
             refund_amount=refund_price,
         )
 
-    # Get all booked flights of a user, with booking_status = 'Confirmed'
-    async def get_user_booked_flights(self, current_user: dict) -> UserBookedFlightsResponse:
-        user = users_collection.find_one({"email": current_user['email']})
-        if not user or "booked_flights" not in user:
-            return UserBookedFlightsResponse(booked_flights=[])
-        # Only return flights with booking_status = 'Confirmed'
-        confirmed_flights = [
-            flight for flight in user["booked_flights"]
-            if flight["booking_status"] == "Confirmed"
-        ]
-
-        booked_flights = []
-        for flight in confirmed_flights:
-            itineraries = []
-            flight_info = Flight(
-                flight_number=flight["flight"],
-                departure_airport=flight["departure_airport"],
-                arrival_airport=flight["arrival_airport"],
-                departure_time=flight["departure_time"],
-                arrival_time=flight["arrival_time"],
-                duration=flight["duration"],
-                carrier_code=flight["carrier_code"],
-            )
-            itinerary = Itinerary(segments=[flight_info])
-            itineraries.append(itinerary)
-
-            price = Price(
-                total=flight["price"]["total"],
-                currency=flight["price"]["currency"],
-                grand_total=flight["price"]["grand_total"],
-            )
-
-            booked_flight = BookFlightResponse(
-                booking_id=flight["_id"],
-                booking_status=flight["booking_status"],
-                itineraries=itineraries,
-                price=price,
-            )
-            booked_flights.append(booked_flight)
-        return UserBookedFlightsResponse(booked_flights=booked_flights)
-
+    # Get the booked flights of a user, with booking_status = 'Confirmed', newest first, one page at a time
+    async def get_user_booked_flights(self, current_user: dict, limit: int = 20,
+                                      cursor: Optional[str] = None) -> UserBookedFlightsResponse:
+        query = {"user_email": current_user['email'], "booking_status": "Confirmed"}
+        if cursor:
+            # continue right after the last booking of the previous page
+            booked_at, booking_id = _decode_cursor(cursor)
+            query["$or"] = [
+                {"booked_at": {"$lt": booked_at}},
+                {"booked_at": booked_at, "_id": {"$lt": booking_id}},
+            ]
+
+        bookings = list(
+            flights_collection.find(query, BOOKING_RESPONSE_FIELDS)
+            .sort([("booked_at", DESCENDING), ("_id", DESCENDING)])
+            .limit(limit + 1)
+        )
+        next_cursor = _encode_cursor(bookings[limit - 1]) if len(bookings) > limit else None
+
+        booked_flights = [_booking_response(flight) for flight in bookings[:limit]]
+        return UserBookedFlightsResponse(booked_flights=booked_flights, next_cursor=next_cursor)
+
+
+def _booking_response(booking: dict) -> BookFlightResponse:
+    # Bookings made from an offer keep every segment; older ones only have the joined flight
+    if booking.get("segments"):
+        segments = [Flight(**segment) for segment in booking["segments"]]
+    else:
+        segments = [Flight(
+            flight_number=booking["flight"],
+            departure_airport=booking["departure_airport"],
+            arrival_airport=booking["arrival_airport"],
+            departure_time=booking["departure_time"],
+            arrival_time=booking["arrival_time"],
+            duration=booking["duration"],
+            carrier_code=booking["carrier_code"],
+        )]
+    return BookFlightResponse(
+        booking_id=booking["_id"],
+        booking_status=booking["booking_status"],
+        itineraries=[Itinerary(segments=segments)],
+        price=Price(
+            total=booking["price"]["total"],
+            currency=booking["price"]["currency"],
+            grand_total=booking["price"]["grand_total"],
+        ),
+    )
+
+
+def _booked_segments(booking: dict):
+    """
+    (carrier, flight number, departure date) of each segment of a booking. Older bookings
+    only have the joined "AC870 -> AC33" flight and the first departure time.
+    """
+    if booking.get("segments"):
+        for segment in booking["segments"]:
+            carrier = segment["carrier_code"]
+            yield carrier, segment["flight_number"][len(carrier):], segment["departure_time"][:10]
+    elif booking.get("flight") and booking.get("departure_time"):
+        first = booking["flight"].split(" -> ")[0]
+        yield first[:2], first[2:], booking["departure_time"][:10]
+
+
+def start_schedule_warmer(service: FlightsService):
+    """
+    Start a daemon thread that runs warm_schedule_cache every FLIGHT_SCHEDULE_WARM_INTERVAL seconds.
+    """
+    global _schedule_warmer
+    if settings.FLIGHT_SCHEDULE_WARM_INTERVAL <= 0 or _schedule_warmer is not None:
+        return
+
+    def run():
+        while True:
+            try:
+                asyncio.run(service.warm_schedule_cache())
+            except Exception as e:
+                print("Error warming flight schedules:", e)
+            time.sleep(settings.FLIGHT_SCHEDULE_WARM_INTERVAL)
+
+    _schedule_warmer = threading.Thread(target=run, name="flight-schedule-warmer", daemon=True)
+    _schedule_warmer.start()
@@ -1,12 +1,15 @@
-import requests
+import asyncio
+import httpx
 import uuid 
 
-from pymongo import UpdateOne
+from pymongo import ASCENDING, DESCENDING, TEXT, UpdateOne
 from bson import ObjectId
-from datetime import datetime, timezone
-from config.settings import Settings
-from config.databse import users_collection, hotels_collection, hotel_bookings_collection
+from datetime import datetime, timezone, timedelta
+from config.settings import Settings, settings
+from config.databse import users_collection, hotels_collection, hotel_bookings_collection, hotel_searches_collection
 from src.models.hotel_model import HotelModel
+from src.utils import metrics
+from src.utils.bulk_upsert import bulk_upsert
 
 RAPIDAPI_HOST = Settings.RAPIDAPI_HOST
 RAPIDAPI_KEY = Settings.RAPIDAPI_KEY
@@ -14,12 +17,138 @@ RAPIDAPI_KEY = Settings.RAPIDAPI_KEY
 
 BASE_URL = f"https://{RAPIDAPI_HOST}/api/hotels/destination/search"
 
+# Shared keep-alive client, created on first use inside the event loop and closed on shutdown
+_http_client = None
 
-def search_hotels(q, check_in_date, check_out_date, adults, children, currency, gl, hl):
-    headers = {
-        "x-rapidapi-host": Settings.RAPIDAPI_HOST,
-        "x-rapidapi-key": Settings.RAPIDAPI_KEY
+
+def get_http_client() -> httpx.AsyncClient:
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        headers = {
+            "x-rapidapi-host": Settings.RAPIDAPI_HOST,
+            "x-rapidapi-key": Settings.RAPIDAPI_KEY
+        }
+        _http_client = httpx.AsyncClient(
+            headers={k: v for k, v in headers.items() if v is not None},
+            timeout=httpx.Timeout(settings.HOTEL_API_TIMEOUT, connect=settings.HOTEL_API_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=settings.HOTEL_API_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HOTEL_API_MAX_KEEPALIVE,
+            ),
+        )
+    return _http_client
+
+
+async def close_http_client():
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+# Fields that identify a stored hotel search; gl / hl only change the language of the results
+SEARCH_KEY_FIELDS = ["city_key", "check_in_date", "check_out_date", "adults", "children", "currency"]
+HOTEL_FIELDS = {"_id": 0, "hotel_id": 1, "name": 1, "description": 1, "rating": 1, "currency": 1, "city": 1}
+
+
+# Sort orders of the local hotel search
+LOCAL_SORTS = {
+    "rating": [("rating", DESCENDING), ("price", ASCENDING)],
+    "price": [("price", ASCENDING), ("rating", DESCENDING)],
+}
+
+
+def ensure_hotel_indexes():
+    hotels_collection.create_index("hotel_id")
+    # local search: city equality first, then the sort key
+    hotels_collection.create_index([("city_key", ASCENDING), ("rating", DESCENDING)])
+    hotels_collection.create_index([("city_key", ASCENDING), ("price", ASCENDING)])
+    hotels_collection.create_index([("name", TEXT), ("description", TEXT)], weights={"name": 5, "description": 1})
+    _backfill_city_keys()
+    hotel_searches_collection.create_index(
+        [(field, ASCENDING) for field in SEARCH_KEY_FIELDS] + [("fetched_at", DESCENDING)]
+    )
+
+
+def city_key(city: str) -> str:
+    # "Los-Angeles" (the extractor's format) and "los angeles" share a key
+    return " ".join(city.lower().replace("-", " ").split())
+
+
+def _backfill_city_keys():
+    """Set city_key on hotels stored before it existed."""
+    ops = [
+        UpdateOne({"_id": h["_id"]}, {"$set": {"city_key": city_key(h["city"])}})
+        for h in hotels_collection.find({"city_key": {"$exists": False}, "city": {"$type": "string"}}, {"city": 1})
+    ]
+    if ops:
+        hotels_collection.bulk_write(ops, ordered=False)
+
+
+def _search_key(q, check_in_date, check_out_date, adults, children, currency) -> dict:
+    return {
+        "city_key": city_key(q),
+        "check_in_date": check_in_date,
+        "check_out_date": check_out_date,
+        "adults": adults,
+        "children": children or 0,
+        "currency": currency,
+    }
+
+
+def _cached_search(search_key: dict):
+    """
+    Hotels of the latest stored search for `search_key` fetched within HOTEL_CACHE_WINDOW,
+    hydrated from the hotels collection with that search's prices, or None.
+    """
+    now = datetime.now(timezone.utc)
+    cutoff = now - timedelta(seconds=settings.HOTEL_CACHE_WINDOW)
+    search = hotel_searches_collection.find_one(
+        {**search_key, "fetched_at": {"$gte": cutoff}}, sort=[("fetched_at", DESCENDING)]
+    )
+    if not search:
+        return None
+
+    age = (now - search["fetched_at"].replace(tzinfo=timezone.utc)).total_seconds()
+    hotels_by_id = {
+        h["hotel_id"]: h for h in hotels_collection.find({"hotel_id": {"$in": search["hotel_ids"]}}, HOTEL_FIELDS)
     }
+    hotels = []
+    for hotel_id, price in zip(search["hotel_ids"], search["prices"]):
+        hotel = hotels_by_id.get(hotel_id)
+        if not hotel:
+            # a hotel of this search is gone, the stored search can't be trusted
+            return None
+        hotels.append(HotelModel(name=hotel["name"], description=hotel["description"], rating=hotel["rating"],
+                                 price_per_night=price, city=hotel["city"],
+                                 currency=search["currency"] or hotel["currency"], from_cache=True,
+                                 cache_age_seconds=age))
+    return hotels
+
+
+def _store_search(search_key: dict, hotels_summary: list):
+    upsert_hotels(hotels_summary)
+    stored = [h for h in hotels_summary if h.get("hotel_id")]
+    hotel_searches_collection.update_one(
+        search_key,
+        {
+            "$set": {
+                "hotel_ids": [h["hotel_id"] for h in stored],
+                "prices": [h["price"] for h in stored],
+                "fetched_at": datetime.now(timezone.utc),
+            }
+        },
+        upsert=True,
+    )
+
+
+async def search_hotels(q, check_in_date, check_out_date, adults, children, currency, gl, hl):
+    search_key = _search_key(q, check_in_date, check_out_date, adults, children, currency)
+    cached = await asyncio.to_thread(_cached_search, search_key)
+    if cached is not None:
+        metrics.increment("hotel_searches.cache_hits")
+        return cached
+    metrics.increment("hotel_searches.cache_misses")
 
     params = {
         "q": q,
@@ -33,7 +162,7 @@ def search_hotels(q, check_in_date, check_out_date, adults, children, currency,
     }
 
     params = {k: v for k, v in params.items() if v is not None}
-    response = requests.get(BASE_URL, headers=headers, params=params)
+    response = await get_http_client().get(BASE_URL, params=params)
     if response.status_code != 200:
         raise Exception(f"Error from RapidAPI: {response.status_code} - {response.text}")
 
@@ -53,7 +182,8 @@ def search_hotels(q, check_in_date, check_out_date, adults, children, currency,
             "city": q
         })
 
-    upsert_hotels(hotels_summary)
+    # pymongo is blocking, keep the writes off the event loop
+    await asyncio.to_thread(_store_search, search_key, hotels_summary)
     hotels = []
 
     for hotel in hotels_summary:
@@ -63,6 +193,42 @@ def search_hotels(q, check_in_date, check_out_date, adults, children, currency,
     # return hotels_summary
 
 
+def search_local_hotels(city: str, text: str = None, min_rating: float = None, max_price: float = None,
+                        sort: str = "rating", limit: int = 20) -> list:
+    """
+    Search the hotels we have already fetched, without calling RapidAPI.
+    Filters on city_key plus an optional full-text match on name / description,
+    a minimum rating and a maximum nightly price (the last price we saw).
+    sort is "rating", "price" or "relevance" (needs `text`).
+    """
+    query = {"city_key": city_key(city), "name": {"$type": "string"}, "price": {"$type": "number"}}
+    if text:
+        query["$text"] = {"$search": text}
+    if min_rating is not None:
+        query["rating"] = {"$gte": min_rating}
+    if max_price is not None:
+        query["price"]["$lte"] = max_price
+
+    projection = {**HOTEL_FIELDS, "price": 1}
+    if sort == "relevance":
+        if not text:
+            raise ValueError("Sorting by relevance needs a text query")
+        projection["score"] = {"$meta": "textScore"}
+        order = [("score", {"$meta": "textScore"})]
+    elif sort in LOCAL_SORTS:
+        order = LOCAL_SORTS[sort]
+    else:
+        raise ValueError(f"Unknown sort: {sort}")
+
+    hotels = []
+    for hotel in hotels_collection.find(query, projection).sort(order).limit(limit):
+        hotels.append(HotelModel(name=hotel["name"], description=hotel.get("description") or "",
+                                 rating=hotel.get("rating") or 0.0, price_per_night=hotel["price"],
+                                 city=hotel.get("city") or city, currency=hotel.get("currency") or "",
+                                 from_cache=True))
+    return hotels
+
+
 
 def create_booking_for_user(user: dict, booking_data: dict) -> dict:
     booking_doc = {
@@ -95,26 +261,24 @@ def get_bookings_by_user_id(user_id: str) -> list:
     return bookings
 
 
-def upsert_hotels(hotels: list):
-    """Upsert each hotel by hotel_id into the hotels collection."""
-    ops = []
+def upsert_hotels(hotels: list) -> dict:
+    """
+    Upsert each hotel by hotel_id into the hotels collection, skipping hotels whose
+    content hasn't changed. Returns the inserted / modified / skipped counts.
+    """
+    docs = []
     for h in hotels:
         if not h.get("hotel_id"):
             continue
-        ops.append(
-            UpdateOne(
-                {"hotel_id": h["hotel_id"]},
-                {
-                    "$set": h,
-                    "$setOnInsert": {
-                        "created_at": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
-                    },
-                },
-                upsert=True,
-            )
-        )
-    if ops:
-        hotels_collection.bulk_write(ops)
+        if h.get("city"):
+            h = {**h, "city_key": city_key(h["city"])}
+        docs.append(h)
+    counts = bulk_upsert(
+        hotels_collection, docs, ["hotel_id"],
+        set_on_insert={"created_at": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")},
+    )
+    metrics.increment("hotels.upsert_skipped", counts["skipped"])
+    return counts
 
 def update_booking_for_user(user_id: str, confirmation_number: str, update_data: dict):
     if not user_id or not confirmation_number:
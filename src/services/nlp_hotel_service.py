@@ -1,22 +1,142 @@
 import os
+import re
 import json
+import calendar
 from dotenv import load_dotenv
 from openai import OpenAI
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from dateparser import parse as parse_date
 from fastapi import HTTPException
 
+from src.utils import metrics
+
 load_dotenv()
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY_OTHER"))
 
 
+# -----------------------------
+# Rule-based fast path
+# -----------------------------
+# Only "in <City>": "near" / "at" usually name a landmark or a hotel, not the city.
+# Capitalised words stop at punctuation; _city_name() also cuts at months and words like "I".
+CITY_PATTERN = re.compile(r"\bin\s+([A-Z][\w']*(?:[ -]+[A-Z][\w']*)*)")
+CITY_STOPWORDS = (
+    {m.lower() for m in calendar.month_name[1:]} | {m.lower() for m in calendar.month_abbr[1:]}
+    | {d.lower() for d in calendar.day_name} | {"from", "for", "between"}
+)
+CITY_MAX_WORDS = 4
+DATE_RANGE_PATTERN = re.compile(
+    r"\b(?:from|between)\s+(.+?)\s+(?:to|until|till|through|and|-|–)\s+(.+?)(?=\s+for\b|\s+with\b|[,;!?]|\.(?:\s|$)|$)",
+    re.IGNORECASE,
+)
+ADULTS_PATTERN = re.compile(r"\b(\d+|one|two|three|four|five|six|seven|eight|nine|ten)\s+adults?\b", re.IGNORECASE)
+# "4 guests including 2 kids" doesn't say how many are adults, leave the party to the LLM
+GUESTS_PATTERN = re.compile(r"\b(?:guests?|people|persons)\b", re.IGNORECASE)
+CHILDREN_PATTERN = re.compile(r"\b(\d+|no|one|two|three|four|five|six|seven|eight|nine|ten)\s+(?:children|child|kids?)\b", re.IGNORECASE)
+ORDINAL_SUFFIX = re.compile(r"(?<=\d)(st|nd|rd|th)\b", re.IGNORECASE)
+NUMBER_WORDS = {"no": 0, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7, "eight": 8,
+                "nine": 9, "ten": 10}
+# Formats without a year get the current year; ensure_future() rolls them forward
+DATE_FORMATS = ("%Y-%m-%d", "%B %d %Y", "%b %d %Y", "%d %B %Y", "%d %b %Y", "%B %d", "%b %d", "%d %B", "%d %b")
+DEFAULTS = {"currency": "CAD", "gl": "us", "hl": "en"}
+
+
+def _count(text: str) -> int:
+    return int(text) if text.isdigit() else NUMBER_WORDS[text.lower()]
+
+
+def _city_name(match: re.Match):
+    """
+    Hyphenated city from a CITY_PATTERN match ("Los Angeles" -> "Los-Angeles"),
+    or None when what is left doesn't look like a city name.
+    """
+    phrase_words = re.split(r"[ -]+", match.group(1))
+    words = []
+    for word in phrase_words:
+        if len(word) == 1 or word.lower() in CITY_STOPWORDS:
+            break
+        words.append(word)
+    if not words or len(words) > CITY_MAX_WORDS:
+        return None
+    # "St. Louis", "Mt. Tremblant": a short word followed by a dot is an abbreviation
+    if len(words) == len(phrase_words) and len(words[-1]) <= 3 and match.string[match.end():match.end() + 1] == ".":
+        return None
+    return "-".join(words)
+
+
+def _strict_date(text: str, start: date = None):
+    """
+    Parse `text` with DATE_FORMATS. For the end of a range, `start` fills in what
+    the text leaves out: the month ("March 10 to 15") and the year.
+    """
+    text = " ".join(ORDINAL_SUFFIX.sub("", text.replace(",", " ")).split())
+    if text.isdigit() and start:
+        try:
+            return start.replace(day=int(text))
+        except ValueError:
+            return None
+    for fmt in DATE_FORMATS:
+        try:
+            parsed = datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+        if "%Y" not in fmt:
+            try:
+                parsed = parsed.replace(year=start.year if start else datetime.now().year)
+            except ValueError:  # Feb 29 outside a leap year
+                return None
+        return parsed.date()
+    return None
+
+
+def rule_extract_hotel_params(user_input: str) -> dict:
+    """
+    Extract q, dates, adults and children with compiled regexes and strict date formats.
+    Only fields found with confidence are returned, so the result can be partial.
+    """
+    extracted = {}
+
+    # several locations ("in Old Town in Prague") are ambiguous, leave q to the LLM
+    cities = list(CITY_PATTERN.finditer(user_input))
+    city = _city_name(cities[0]) if len(cities) == 1 else None
+    if city:
+        extracted["q"] = city
+
+    dates = DATE_RANGE_PATTERN.search(user_input)
+    if dates:
+        check_in = _strict_date(dates.group(1))
+        check_out = _strict_date(dates.group(2), start=check_in) if check_in else None
+        # a range out of order (e.g. across new year) isn't certain, the LLM reads it
+        if check_in and check_out and check_out > check_in:
+            extracted["check_in_date"] = check_in.isoformat()
+            extracted["check_out_date"] = check_out.isoformat()
+
+    adults = ADULTS_PATTERN.search(user_input)
+    if adults and not GUESTS_PATTERN.search(user_input):
+        extracted["adults"] = _count(adults.group(1))
+        children = CHILDREN_PATTERN.search(user_input)
+        extracted["children"] = _count(children.group(1)) if children else 0
+
+    return extracted
+
+
 def extract_hotel_search_params(user_input: str):
     """
-    Extracts structured hotel search parameters using GPT,
-    then validates and corrects dates to ensure they are always
-    valid future ISO dates for the external hotel search API.
+    Extracts structured hotel search parameters, with rules first and GPT only for
+    what the rules could not find, then validates and corrects dates to ensure they
+    are always valid future ISO dates for the external hotel search API.
     """
+    partial = rule_extract_hotel_params(user_input)
+    if all(key in partial for key in ("q", "check_in_date", "check_out_date", "adults", "children")):
+        metrics.increment("hotel_extractor.rules")
+        data = {**partial, **DEFAULTS}
+    else:
+        metrics.increment("hotel_extractor.llm")
+        data = _llm_extract(user_input, partial)
+    return _validate_params(data)
+
 
+def _llm_extract(user_input: str, partial: dict) -> dict:
     # -----------------------------
     # Prompt for GPT
     # -----------------------------
@@ -31,6 +151,7 @@ def extract_hotel_search_params(user_input: str):
       Keep the letters and punctuation intact otherwise. Return the hyphenated name in quotes.
     - Required keys: q, check_in_date, check_out_date, adults, children, currency, gl, hl.
     - currency="CAD", gl="us", hl="en".
+    - Keys already extracted below are correct: copy them as they are and only fill the others.
 
     EXAMPLES:
     Input: "Find hotels in Paris from March 10 to March 15 for 2 adults"
@@ -51,6 +172,7 @@ def extract_hotel_search_params(user_input: str):
 
     YOUR TURN.
     Input: "{user_input}"
+    Already extracted: {json.dumps(partial)}
     """
 
     # -----------------------------
@@ -73,6 +195,8 @@ def extract_hotel_search_params(user_input: str):
         data = json.loads(raw_output)
     except json.JSONDecodeError:
         raise ValueError(f"GPT returned invalid JSON:\n{raw_output}")
+    # fields the rules found win over the model output
+    data.update(partial)
 
     # -----------------------------
     # 3. Strict key validation
@@ -84,6 +208,10 @@ def extract_hotel_search_params(user_input: str):
     for key in required_keys:
         if key not in data:
             raise ValueError(f"Missing key: {key}\nOutput: {raw_output}")
+    return data
+
+
+def _validate_params(data: dict) -> dict:
 
     # -----------------------------
     # 4. Strict ISO parser
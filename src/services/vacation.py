@@ -1,6 +1,7 @@
 import httpx
 from fastapi import HTTPException, Query
 
+from src.utils.airport_resolver import get_airport_resolver
 from src.utils.http_helpers import request_with_retry
 from src.utils.vacation_extractor import hybrid_extract
 
@@ -58,6 +59,10 @@ async def plan_vacation_service(user_raw_input: str, user_email: str, user_token
         "children": flight["flight"].get("children", 0),
         "infants": flight["flight"].get("infants", 0)
     }
+    # Turn city names into IATA codes locally, so the flights service doesn't need the LLM for them
+    resolver = get_airport_resolver()
+    for field in ("departure_airport", "arrival_airport"):
+        payload_flight[field] = resolver.exact(payload_flight[field]) or payload_flight[field]
 
     hotel_dict = hotel_query["hotel"]
     user_input = f"Find hotels in {hotel_dict['destination']} from {hotel_dict['check_in']} to {hotel_dict['check_out']} for {hotel_dict['guests']} guests"
@@ -0,0 +1,148 @@
+import bisect
+import csv
+import functools
+import os
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Optional
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+# Minimum trigram similarity (Dice coefficient) for a typo-tolerant match
+FUZZY_MIN_SCORE = 0.5
+
+
+def normalize_name(text: str) -> str:
+    """
+    Lowercase, strip accents and punctuation: "Montréal" -> "montreal", "St. John's" -> "st johns".
+    """
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    text = text.lower().replace("-", " ").replace("_", " ").replace("/", " ")
+    text = re.sub(r"[^a-z0-9 ]", "", text)
+    return " ".join(text.split())
+
+
+def _trigrams(key: str) -> set:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def load_airports(path: str = None) -> list:
+    with open(path or os.path.join(DATA_DIR, "airports.csv"), newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+class AirportResolver:
+    """
+    In-memory index over the bundled airport table that turns a code, city or airport
+    name into an IATA code. Three lookups, tried in order:
+      - exact: IATA code or normalized city / airport name (dict)
+      - prefix: sorted name list searched with bisect ("monte" -> Montreal)
+      - fuzzy: trigram inverted index scored by Dice similarity ("Montrael" -> Montreal)
+    When a city has several airports, the first one listed in the table is its main one.
+    """
+
+    def __init__(self, airports: list = None):
+        airports = airports if airports is not None else load_airports()
+        self.airports = {row["iata"]: row for row in airports}
+
+        self.names = {}  # normalized name -> iata
+        for row in airports:
+            for name in (row["city"], row["name"]):
+                self.names.setdefault(normalize_name(name), row["iata"])
+        self.keys = sorted(self.names)
+
+        self.key_trigrams = [_trigrams(key) for key in self.keys]
+        self.trigram_index = defaultdict(list)  # trigram -> ids into self.keys
+        for key_id, grams in enumerate(self.key_trigrams):
+            for gram in grams:
+                self.trigram_index[gram].append(key_id)
+
+    def __len__(self):
+        return len(self.airports)
+
+    def get(self, iata: str) -> Optional[dict]:
+        return self.airports.get(iata.upper()) if iata else None
+
+    def exact(self, text: str) -> Optional[str]:
+        if not text or not isinstance(text, str):
+            return None
+        text = text.strip()
+        if len(text) == 3 and text.upper() in self.airports:
+            return text.upper()
+        return self.names.get(normalize_name(text))
+
+    def prefix(self, text: str, limit: int = 5) -> list:
+        """
+        IATA codes of names starting with `text`, shortest name first.
+        """
+        query = normalize_name(text)
+        if not query:
+            return []
+        start = bisect.bisect_left(self.keys, query)
+        end = bisect.bisect_left(self.keys, query + "\x7f", lo=start)
+        matches = sorted(self.keys[start:end], key=len)
+        return _unique(self.names[key] for key in matches)[:limit]
+
+    def fuzzy(self, text: str, limit: int = 5, min_score: float = FUZZY_MIN_SCORE) -> list:
+        """
+        (iata, score) pairs of the names most similar to `text`, best first.
+        """
+        query = normalize_name(text)
+        if not query:
+            return []
+        grams = _trigrams(query)
+        shared = defaultdict(int)
+        for gram in grams:
+            for key_id in self.trigram_index.get(gram, ()):
+                shared[key_id] += 1
+
+        scored = []
+        for key_id, count in shared.items():
+            score = 2 * count / (len(grams) + len(self.key_trigrams[key_id]))
+            if score >= min_score:
+                scored.append((score, self.keys[key_id]))
+        scored.sort(key=lambda item: (-item[0], item[1]))
+
+        results = []
+        seen = set()
+        for score, key in scored:
+            iata = self.names[key]
+            if iata not in seen:
+                seen.add(iata)
+                results.append((iata, round(score, 3)))
+            if len(results) == limit:
+                break
+        return results
+
+    def resolve(self, text) -> Optional[str]:
+        """
+        Best IATA code for `text` (exact, then prefix, then fuzzy), or None.
+        Prefix and fuzzy hits are guesses ("Portland" lands on Porto), so anything
+        that searches or books flights should only trust exact().
+        """
+        if not text or not isinstance(text, str):
+            return None
+        iata = self.exact(text)
+        if iata:
+            return iata
+        if len(normalize_name(text)) >= 3:
+            matches = self.prefix(text, limit=1)
+            if matches:
+                return matches[0]
+        matches = self.fuzzy(text, limit=1)
+        return matches[0][0] if matches else None
+
+
+def _unique(values) -> list:
+    seen = set()
+    return [v for v in values if not (v in seen or seen.add(v))]
+
+
+@functools.lru_cache(maxsize=1)
+def get_airport_resolver() -> AirportResolver:
+    """
+    Process-wide resolver over the bundled table, built on first use.
+    """
+    return AirportResolver()
@@ -0,0 +1,30 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from amadeus import Client
+
+
+class AsyncAmadeus:
+    """
+    Awaitable access to the (synchronous) Amadeus SDK. Every call runs on a bounded
+    thread pool so a slow Amadeus round trip never blocks the event loop, and at most
+    `max_workers` requests are in flight at once.
+    """
+
+    def __init__(self, client: Client, max_workers: int = 8):
+        self.client = client
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="amadeus")
+
+    async def run(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+
+    async def flight_offers_search(self, **params):
+        return await self.run(self.client.shopping.flight_offers_search.get, **params)
+
+    async def schedule_flights(self, **params):
+        return await self.run(self.client.schedule.flights.get, **params)
+
+    def close(self):
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,186 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # no cross-process locking on Windows; each worker then refreshes on its own
+    fcntl = None
+
+from amadeus import Client
+
+from config.settings import settings
+from src.utils import metrics
+from src.utils.amadeus_async import AsyncAmadeus
+
+# A request still uses a token that has at least this many seconds left
+TOKEN_MARGIN = 30
+
+
+class SharedAccessToken:
+    """
+    Drop-in replacement for the Amadeus SDK's per-client AccessToken (the SDK only calls
+    `_bearer_token()`). The token and its expiry are kept in memory and in a JSON file
+    shared by every worker on the host: a worker that starts, or finds its token about
+    to expire, first reuses a fresh token from the file and only negotiates a new one
+    while holding the file lock, so one worker refreshes for all of them.
+    """
+
+    def __init__(self, client: Client, path: str, refresh_ahead: float = 300):
+        self.client = client
+        self.path = path
+        self.refresh_ahead = refresh_ahead
+        # tokens of other credentials / environments in the same file are ignored
+        self.key = hashlib.sha256(f"{client.host}|{client.client_id}".encode("utf-8")).hexdigest()
+        self.access_token = None
+        self.expires_at = 0
+        self._lock = threading.Lock()
+
+    def _bearer_token(self):
+        return "Bearer {0}".format(self.token())
+
+    def token(self) -> str:
+        if self.access_token is not None and time.time() + TOKEN_MARGIN < self.expires_at:
+            return self.access_token
+        return self.refresh()
+
+    def refresh(self, min_validity: float = TOKEN_MARGIN) -> str:
+        """
+        Make sure the in-memory token is valid for at least `min_validity` seconds: take
+        it from the shared file if another worker already refreshed it, otherwise fetch
+        a new one and publish it.
+        """
+        with self._lock:
+            with _FileLock(self.path + ".lock"):
+                stored = self._read()
+                if stored and stored.get("access_token") and time.time() + min_validity < stored["expires_at"]:
+                    metrics.increment("amadeus_token.shared")
+                    self.access_token, self.expires_at = stored["access_token"], stored["expires_at"]
+                    return self.access_token
+
+                response = self.client._unauthenticated_request(
+                    "POST",
+                    "/v1/security/oauth2/token",
+                    {
+                        "grant_type": "client_credentials",
+                        "client_id": self.client.client_id,
+                        "client_secret": self.client.client_secret,
+                    },
+                )
+                metrics.increment("amadeus_token.fetched")
+                self.access_token = response.result.get("access_token")
+                self.expires_at = int(time.time()) + response.result.get("expires_in", 0)
+                self._write()
+                return self.access_token
+
+    def seconds_until_refresh(self) -> float:
+        return self.expires_at - self.refresh_ahead - time.time()
+
+    def _read(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return stored if stored.get("key") == self.key else None
+
+    def _write(self):
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"key": self.key, "access_token": self.access_token, "expires_at": self.expires_at}, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print("Could not share the Amadeus token:", e)
+
+
+class _FileLock:
+    """
+    Exclusive advisory lock on `path` held for the duration of a with-block.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.fd = None
+
+    def __enter__(self):
+        if fcntl is None:
+            return self
+        try:
+            self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+        except OSError as e:
+            print("Could not lock the Amadeus token file:", e)
+            self.fd = None
+        return self
+
+    def __exit__(self, *exc):
+        if self.fd is not None:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+            os.close(self.fd)
+            self.fd = None
+
+
+_client = None
+_async_client = None
+_client_lock = threading.Lock()
+_refresher = None
+
+
+def get_amadeus_client() -> Client:
+    """
+    The process-wide Amadeus client, using the host-wide shared access token.
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            client = Client(
+                client_id=os.getenv("AMADEUS_CLIENT_ID"),
+                client_secret=os.getenv("AMADEUS_CLIENT_SECRET"),
+            )
+            client.access_token = SharedAccessToken(
+                client, settings.AMADEUS_TOKEN_PATH, refresh_ahead=settings.AMADEUS_TOKEN_REFRESH_AHEAD
+            )
+            _client = client
+        return _client
+
+
+def get_async_amadeus() -> AsyncAmadeus:
+    """
+    The process-wide AsyncAmadeus, so every service shares one bounded thread pool.
+    """
+    global _async_client
+    client = get_amadeus_client()
+    with _client_lock:
+        if _async_client is None:
+            _async_client = AsyncAmadeus(client, max_workers=settings.AMADEUS_MAX_WORKERS)
+        return _async_client
+
+
+def start_token_refresher():
+    """
+    Start a daemon thread that gets a token at startup and renews it refresh_ahead seconds
+    before it expires, so requests never wait for token negotiation.
+    """
+    global _refresher
+    if _refresher is not None and _refresher.is_alive():
+        return _refresher
+    token = get_amadeus_client().access_token
+
+    def run():
+        while True:
+            try:
+                if token.seconds_until_refresh() <= 0:
+                    token.refresh(min_validity=token.refresh_ahead)
+                wait = token.seconds_until_refresh()
+            except Exception as e:
+                print("Amadeus token refresh failed:", e)
+                wait = 30
+            time.sleep(max(wait, 5))
+
+    _refresher = threading.Thread(target=run, name="amadeus-token-refresher", daemon=True)
+    _refresher.start()
+    return _refresher
@@ -0,0 +1,59 @@
+import hashlib
+import json
+
+from pymongo import UpdateOne
+
+HASH_FIELD = "content_hash"
+
+
+def content_hash(doc: dict, exclude=()) -> str:
+    """
+    Stable sha256 of a document's fields (keys sorted), ignoring the `exclude` fields.
+    """
+    payload = json.dumps(
+        {k: v for k, v in doc.items() if k not in exclude and k != HASH_FIELD},
+        sort_keys=True, ensure_ascii=False, default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def bulk_upsert(collection, docs: list, key_fields: list, set_on_insert: dict = None, changed_update: dict = None,
+                current_filter: dict = None, exclude_from_hash=(), batch_size: int = 500) -> dict:
+    """
+    Upsert `docs` keyed by `key_fields`, writing only the documents whose content hash
+    differs from the one stored with them. Writes go out as unordered bulk_writes of at
+    most `batch_size` operations.
+
+    set_on_insert:   extra $setOnInsert fields for new documents
+    changed_update:  extra update operators applied only to written documents (e.g. {"$inc": {"version": 1}})
+    current_filter:  stored documents outside this filter (e.g. tombstones) are always rewritten
+
+    Returns {"inserted": n, "modified": n, "skipped": n}.
+    """
+    counts = {"inserted": 0, "modified": 0, "skipped": 0}
+    for start in range(0, len(docs), batch_size):
+        batch = docs[start:start + batch_size]
+        hashes = [content_hash(doc, exclude_from_hash) for doc in batch]
+
+        keys = [{field: doc.get(field) for field in key_fields} for doc in batch]
+        projection = {HASH_FIELD: 1, **{field: 1 for field in key_fields}}
+        stored = {
+            tuple(s.get(field) for field in key_fields): s.get(HASH_FIELD)
+            for s in collection.find({"$or": keys, **(current_filter or {})}, projection)
+        }
+
+        ops = []
+        for doc, key, doc_hash in zip(batch, keys, hashes):
+            if stored.get(tuple(key.values())) == doc_hash:
+                counts["skipped"] += 1
+                continue
+            update = {"$set": {**doc, HASH_FIELD: doc_hash}, **(changed_update or {})}
+            if set_on_insert:
+                update["$setOnInsert"] = set_on_insert
+            ops.append(UpdateOne(key, update, upsert=True))
+
+        if ops:
+            result = collection.bulk_write(ops, ordered=False)
+            counts["inserted"] += result.upserted_count
+            counts["modified"] += result.modified_count
+    return counts
@@ -0,0 +1,156 @@
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from src.utils import metrics
+
+
+class TTLCache:
+    """
+    Thread-safe in-process cache with a max size (LRU eviction) and a per-entry TTL.
+    When `path` is set, entries are also written to a SQLite file so hot entries
+    survive restarts and are shared by workers on the same host.
+    Hits and misses are counted on the instance and in src.utils.metrics under `name`.
+    """
+
+    def __init__(self, name: str, maxsize: int = 1024, ttl: float = 3600, path: Optional[str] = None,
+                 clock=time.time):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data = OrderedDict()  # key -> (stored_at, expires_at, value)
+        self._lock = threading.Lock()
+        self._disk = _DiskTier(path, maxsize * 10) if path else None
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value, _ = self.get_with_age(key)
+        return default if value is None else value
+
+    def get_with_age(self, key: str):
+        """
+        Return (value, age in seconds) for a fresh entry, or (None, None) on a miss.
+        """
+        now = self._clock()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry and entry[1] <= now:
+                del self._data[key]
+                entry = None
+            if entry:
+                self._data.move_to_end(key)
+
+        if entry is None and self._disk:
+            entry = self._disk.get(key, now)
+            if entry:
+                with self._lock:
+                    self._store(key, entry)
+
+        if entry is None:
+            self.misses += 1
+            metrics.increment(f"{self.name}.misses")
+            return None, None
+        self.hits += 1
+        metrics.increment(f"{self.name}.hits")
+        return entry[2], now - entry[0]
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        now = self._clock()
+        entry = (now, now + (self.ttl if ttl is None else ttl), value)
+        with self._lock:
+            self._store(key, entry)
+        if self._disk:
+            self._disk.set(key, entry)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._data.pop(key, None)
+        if self._disk:
+            self._disk.delete(key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+        if self._disk:
+            self._disk.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def __len__(self):
+        return len(self._data)
+
+    def _store(self, key, entry):
+        self._data[key] = entry
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+
+class _DiskTier:
+    """
+    SQLite-backed second tier for TTLCache. Values are pickled.
+    """
+
+    PRUNE_EVERY = 100
+
+    def __init__(self, path: str, maxsize: int):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, stored_at REAL, expires_at REAL, value BLOB)"
+            )
+
+    def get(self, key, now):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT stored_at, expires_at, value FROM cache WHERE key = ? AND expires_at > ?",
+                (key, now),
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], row[1], pickle.loads(row[2])
+
+    def set(self, key, entry):
+        stored_at, expires_at, value = entry
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, stored_at, expires_at, value) VALUES (?, ?, ?, ?)",
+                (key, stored_at, expires_at, pickle.dumps(value)),
+            )
+            self._writes += 1
+            if self._writes % self.PRUNE_EVERY == 0:
+                self._prune(stored_at)
+
+    def delete(self, key):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM cache")
+
+    def _prune(self, now):
+        # drop expired rows, then the least recently stored ones above maxsize
+        self._conn.execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+        self._conn.execute(
+            "DELETE FROM cache WHERE key IN ("
+            "SELECT key FROM cache ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+            (self.maxsize,),
+        )
@@ -0,0 +1,354 @@
+import re
+import threading
+from collections import defaultdict
+
+import numpy as np
+
+from src.utils.vector_index import ExactIndex, build_index, top_k_indices
+
+
+# How strongly the distance between a destination's average cost and the user's budget
+# lowers its score (same weight the per-item loop used)
+BUDGET_PENALTY_WEIGHT = 0.3
+
+# With an approximate index, fetch this many candidates per requested result before
+# applying the budget penalty, so the penalty can still reorder them
+ANN_OVERSAMPLE = 20
+ANN_MIN_CANDIDATES = 100
+
+# Rebuild an approximate index once this share of rows changed since it was built
+REBUILD_FRACTION = 0.1
+
+MONTHS = ["january", "february", "march", "april", "may", "june", "july",
+          "august", "september", "october", "november", "december"]
+ALL_MONTHS = (1 << 12) - 1
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """
+    L2-normalize each row, leaving all-zero rows untouched.
+    """
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class DestinationRanker:
+    """
+    In-memory ranking engine for destination recommendations.
+    Destination vectors are pre-normalized and kept as one contiguous float32 matrix
+    so the whole catalog is scored with a single matrix-vector product.
+    For large catalogs an approximate index (see src.utils.vector_index) narrows
+    the catalog down to a candidate set first.
+
+    Destinations can be inserted, updated and removed in place (upsert / remove).
+    Removed rows are masked out and reused by later inserts. Rows changed since an
+    approximate index was built are scored exactly until the index is rebuilt.
+
+    Hard filters (country, tags, average_cost range, travel month) are evaluated on
+    precomputed per-row attributes before any vector math, and only the surviving
+    rows are scored.
+    """
+
+    def __init__(self, destinations: list, vectors, index_kind: str = "exact",
+                 ann_min_size: int = 20_000, n_probe: int = 16, key: str = "_id"):
+        self.key = key
+        self.index_kind = index_kind
+        self.ann_min_size = ann_min_size
+        self.n_probe = n_probe
+        self._lock = threading.RLock()
+
+        self.destinations = list(destinations)
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if matrix.ndim != 2:
+            matrix = matrix.reshape(len(destinations), -1 if len(destinations) else 0)
+        self._size = len(self.destinations)
+        self._matrix = np.ascontiguousarray(_normalize_rows(matrix), dtype=np.float32)
+        self._costs = np.asarray([d.get("average_cost") or 0.0 for d in destinations], dtype=np.float32)
+        self._active = np.ones(self._size, dtype=bool)
+        self._row_version = np.zeros(self._size, dtype=np.int64)
+        self._rows = {d.get(key, i): i for i, d in enumerate(self.destinations)}  # row number when unkeyed
+        self._free = []
+        self._dirty = set()
+        self.index = self._build_index(self.matrix)
+
+        # filter attributes: interned country per row, inverted tag index, 12-bit month mask per row
+        self._country_ids = {}
+        self._country = np.full(self._size, -1, dtype=np.int32)
+        self._tag_rows = defaultdict(set)
+        self._months = np.zeros(self._size, dtype=np.uint16)
+        for row, destination in enumerate(self.destinations):
+            self._index_attributes(row, destination)
+
+    @property
+    def matrix(self) -> np.ndarray:
+        return self._matrix[:self._size]
+
+    @property
+    def average_cost(self) -> np.ndarray:
+        return self._costs[:self._size]
+
+    def __len__(self):
+        return len(self._rows)
+
+    def get(self, key):
+        """
+        Return the destination stored under `key`, or None.
+        """
+        with self._lock:
+            row = self._rows.get(key)
+            return None if row is None else self.destinations[row]
+
+    def scores(self, query_vec, budget: float = None) -> np.ndarray:
+        """
+        Cosine similarity of the query against every row, adjusted by the budget penalty
+        when a budget is given. Removed rows score -inf.
+        """
+        query = _normalize_query(query_vec)
+        with self._lock:
+            scores = self._apply_budget(self.matrix @ query, self.average_cost, budget)
+            return np.where(self._active[:self._size], scores, -np.inf)
+
+    def rank(self, query_vec, limit: int = 5, budget: float = None, filters: dict = None) -> list:
+        """
+        Return the top `limit` destinations (as copies) ordered by descending score.
+        `filters` may hold country, tags (all required), min_cost, max_cost and month (1-12).
+        """
+        if limit <= 0:
+            return []
+        with self._lock:
+            if not self._rows:
+                return []
+            if filters:
+                rows = np.nonzero(self._filter_mask(filters))[0]
+                query = _normalize_query(query_vec)
+                scores = self._apply_budget(self._matrix[rows] @ query, self._costs[rows], budget)
+                return [dict(self.destinations[rows[i]]) for i in top_k_indices(scores, limit)]
+            if not self.index.approximate:
+                scores = self.scores(query_vec, budget)
+                top = top_k_indices(scores, min(limit, len(self._rows)))
+                return [dict(self.destinations[i]) for i in top]
+
+            query = _normalize_query(query_vec)
+            ids, similarities = self.index.search(query, max(limit * ANN_OVERSAMPLE, ANN_MIN_CANDIDATES))
+            # drop removed rows and rows whose indexed vector is out of date ...
+            keep = self._active[ids] & ~np.isin(ids, list(self._dirty))
+            ids, similarities = ids[keep], similarities[keep]
+            # ... and score the rows changed since the index was built exactly
+            if self._dirty:
+                dirty = np.fromiter(self._dirty, dtype=np.intp, count=len(self._dirty))
+                ids = np.concatenate((ids, dirty))
+                similarities = np.concatenate((similarities, self._matrix[dirty] @ query))
+            scores = self._apply_budget(similarities, self._costs[ids], budget)
+            return [dict(self.destinations[ids[i]]) for i in top_k_indices(scores, limit)]
+
+    def rank_many(self, query_vecs, limits: list, budgets: list = None) -> list:
+        """
+        Rank several queries at once. With exact search the whole batch is scored with
+        one matrix-matrix product; returns one list of destinations per query.
+        """
+        if len(query_vecs) == 0:
+            return []
+        budgets = budgets or [None] * len(limits)
+        with self._lock:
+            if not self._rows or self.index.approximate:
+                return [self.rank(q, limit, budget) for q, limit, budget in zip(query_vecs, limits, budgets)]
+
+            queries = _normalize_rows(np.asarray(query_vecs, dtype=np.float32))
+            scores = queries @ self.matrix.T
+            costs = self.average_cost
+            budget_col = np.array([float(b) if b is not None and float(b) > 0 else np.nan for b in budgets],
+                                  dtype=np.float32)[:, None]
+            penalized = (~np.isnan(budget_col)) & (costs > 0)
+            with np.errstate(invalid="ignore"):
+                penalty = 1 - BUDGET_PENALTY_WEIGHT * np.abs(costs - budget_col) / budget_col
+            scores = np.where(penalized, scores * penalty, scores)
+            scores[:, ~self._active[:self._size]] = -np.inf
+
+            results = []
+            for row_scores, limit in zip(scores, limits):
+                top = top_k_indices(row_scores, min(limit, len(self._rows)))
+                results.append([dict(self.destinations[i]) for i in top])
+            return results
+
+    def upsert(self, destination: dict, vector):
+        """
+        Insert a destination, or replace the one stored under the same key.
+        """
+        vector = np.asarray(vector, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vector)
+        if norm:
+            vector = vector / norm
+        with self._lock:
+            key = destination.get(self.key)
+            row = self._rows.get(key)
+            if row is None:
+                row = self._free.pop() if self._free else self._append_row(len(vector))
+                self._rows[key] = row
+            if self.destinations[row] is not None:
+                self._unindex_attributes(row)
+            self._matrix[row] = vector
+            self._costs[row] = destination.get("average_cost") or 0.0
+            self._active[row] = True
+            self._row_version[row] += 1
+            self.destinations[row] = destination
+            self._index_attributes(row, destination)
+            if self.index.approximate:
+                self._dirty.add(row)
+
+    def remove(self, key) -> bool:
+        """
+        Remove the destination stored under `key`. Returns False if it was not there.
+        """
+        with self._lock:
+            row = self._rows.pop(key, None)
+            if row is None:
+                return False
+            self._unindex_attributes(row)
+            self._active[row] = False
+            self._matrix[row] = 0.0
+            self._row_version[row] += 1
+            self.destinations[row] = None
+            self._dirty.discard(row)
+            self._free.append(row)
+            return True
+
+    def needs_rebuild(self) -> bool:
+        """
+        True when enough rows changed since the approximate index was built, or when
+        an "auto" catalog grew large enough to switch from exact to approximate search.
+        """
+        with self._lock:
+            if self.index.approximate:
+                return len(self._dirty) > REBUILD_FRACTION * max(len(self._rows), 1)
+            return self.index_kind == "auto" and len(self._rows) >= self.ann_min_size
+
+    def rebuild_index(self):
+        """
+        Rebuild the vector index from the current rows. The (possibly slow) build runs
+        on a snapshot without holding the lock; rows changed meanwhile stay dirty.
+        """
+        with self._lock:
+            size = self._size
+            snapshot = self._matrix[:size].copy()
+            versions = self._row_version[:size].copy()
+        index = self._build_index(snapshot)
+        with self._lock:
+            self.index = index
+            self._dirty = set()
+            if index.approximate:
+                changed = np.nonzero(self._row_version[:size] != versions)[0].tolist()
+                changed += range(size, self._size)
+                self._dirty = {row for row in changed if self._active[row]}
+
+    def _filter_mask(self, filters: dict) -> np.ndarray:
+        """
+        Boolean mask of the active rows that pass every given filter.
+        """
+        mask = self._active[:self._size].copy()
+        if filters.get("country"):
+            country = self._country_ids.get(filters["country"].strip().lower(), -2)
+            mask &= self._country[:self._size] == country
+        for tag in filters.get("tags") or []:
+            tag_mask = np.zeros(self._size, dtype=bool)
+            tag_mask[list(self._tag_rows.get(tag.strip().lower(), ()))] = True
+            mask &= tag_mask
+        if filters.get("min_cost") is not None:
+            mask &= self.average_cost >= float(filters["min_cost"])
+        if filters.get("max_cost") is not None:
+            mask &= self.average_cost <= float(filters["max_cost"])
+        if filters.get("month"):
+            mask &= (self._months[:self._size] & (1 << (int(filters["month"]) - 1))) != 0
+        return mask
+
+    def _index_attributes(self, row: int, destination: dict):
+        if row >= len(self._country):
+            capacity = len(self._matrix)
+            self._country = _grow(self._country, (capacity,), fill=-1)
+            self._months = _grow(self._months, (capacity,))
+        country = (destination.get("country") or "").strip().lower()
+        self._country[row] = self._country_ids.setdefault(country, len(self._country_ids)) if country else -1
+        for tag in destination.get("tags") or []:
+            self._tag_rows[tag.strip().lower()].add(row)
+        self._months[row] = travel_months_mask(destination.get("best_time_to_visit"))
+
+    def _unindex_attributes(self, row: int):
+        for tag in self.destinations[row].get("tags") or []:
+            rows = self._tag_rows.get(tag.strip().lower())
+            if rows:
+                rows.discard(row)
+        self._country[row] = -1
+        self._months[row] = 0
+
+    def _build_index(self, matrix: np.ndarray):
+        if len(matrix) == 0:
+            return ExactIndex(matrix)
+        return build_index(matrix, self.index_kind, self.ann_min_size, self.n_probe)
+
+    def _append_row(self, dim: int) -> int:
+        if self._size == len(self._matrix):
+            capacity = max(16, 2 * len(self._matrix))
+            dim = self._matrix.shape[1] if self._matrix.size else dim
+            self._matrix = _grow(self._matrix, (capacity, dim))
+            self._costs = _grow(self._costs, (capacity,))
+            self._active = _grow(self._active, (capacity,))
+            self._row_version = _grow(self._row_version, (capacity,))
+        self.destinations.append(None)
+        self._size += 1
+        return self._size - 1
+
+    @staticmethod
+    def _apply_budget(scores: np.ndarray, costs: np.ndarray, budget: float = None) -> np.ndarray:
+        if budget is None or float(budget) <= 0:
+            return scores
+        budget = float(budget)
+        penalty = 1 - BUDGET_PENALTY_WEIGHT * np.abs(costs - budget) / budget
+        return np.where(costs > 0, scores * penalty, scores)
+
+
+def _grow(array: np.ndarray, shape: tuple, fill=0) -> np.ndarray:
+    grown = np.full(shape, fill, dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
+def travel_months_mask(best_time_to_visit: str) -> int:
+    """
+    Parse text like "April–October" or "June–August, December–March" into a 12-bit
+    mask (bit 0 = January). Ranges wrap around the new year, "year-round" sets every
+    month and unparseable text gives 0.
+    """
+    if not best_time_to_visit:
+        return 0
+    if re.search(r"year[- ]round|all year", best_time_to_visit, flags=re.I):
+        return ALL_MONTHS
+    mask = 0
+    for part in best_time_to_visit.split(","):
+        names = [_month_number(name) for name in re.split(r"\s*(?:–|—|-|\bto\b)\s*", part.strip(), flags=re.I)]
+        names = [n for n in names if n]
+        if len(names) == 1:
+            mask |= 1 << (names[0] - 1)
+        elif len(names) == 2:
+            month = names[0]
+            while True:
+                mask |= 1 << (month - 1)
+                if month == names[1]:
+                    break
+                month = month % 12 + 1
+    return mask & ALL_MONTHS
+
+
+def _month_number(name: str) -> int:
+    name = name.strip().lower()
+    if len(name) < 3:
+        return 0
+    for number, month in enumerate(MONTHS, start=1):
+        if month.startswith(name):
+            return number
+    return 0
+
+
+def _normalize_query(query_vec) -> np.ndarray:
+    query = np.asarray(query_vec, dtype=np.float32).ravel()
+    norm = np.linalg.norm(query)
+    return query / norm if norm else query
@@ -0,0 +1,117 @@
+import csv
+import os
+import re
+from datetime import datetime
+from typing import Optional
+
+from src.utils.airport_resolver import DATA_DIR, AirportResolver, get_airport_resolver, normalize_name
+
+# Only unambiguous formats; "02/01/2026" could be either day or month first, so it goes to the LLM
+DATE_FORMATS = ("%Y-%m-%d", "%Y/%m/%d", "%Y %m %d", "%B %d %Y", "%b %d %Y", "%d %B %Y", "%d %b %Y")
+ORDINAL_SUFFIX = re.compile(r"(?<=\d)(st|nd|rd|th)\b", re.IGNORECASE)
+
+CABIN_CLASSES = {
+    "economy": "Economy",
+    "eco": "Economy",
+    "coach": "Economy",
+    "premium economy": "Premium_Economy",
+    "premium": "Premium_Economy",
+    "business": "Business",
+    "first": "First",
+    "first class": "First",
+    "business class": "Business",
+    "economy class": "Economy",
+}
+
+DEFAULTS = {
+    "cabin_class": "Economy",
+    "currency": "CAD",
+    "adults": 1,
+    "children": 0,
+    "infants": 0,
+    "airline": "",
+}
+
+
+def _read_csv(filename: str) -> list:
+    with open(os.path.join(DATA_DIR, filename), newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+class LocalFlightNormalizer:
+    """
+    Resolves flight search fields without the LLM, using the bundled airport and
+    airline tables. Airports only resolve on exact AirportResolver hits (codes, city
+    and airport names); prefixes and typos are left to the LLM. Airline codes and
+    names go through a name index, and dates only parse with strict formats.
+    """
+
+    def __init__(self, airports: list = None, airlines: list = None):
+        airlines = airlines if airlines is not None else _read_csv("airlines.csv")
+
+        self.airport_resolver = AirportResolver(airports) if airports is not None else get_airport_resolver()
+        self.airlines = {row["iata"]: row for row in airlines}
+        self.airline_names = {normalize_name(row["name"]): row["iata"] for row in airlines}
+
+    def resolve_airport(self, value) -> Optional[str]:
+        return self.airport_resolver.exact(value)
+
+    def resolve_airline(self, value) -> Optional[str]:
+        if value is None or (isinstance(value, str) and not value.strip()):
+            return ""
+        if not isinstance(value, str):
+            return None
+        value = value.strip()
+        if len(value) == 2 and value.upper() in self.airlines:
+            return value.upper()
+        return self.airline_names.get(normalize_name(value))
+
+    def resolve_date(self, value) -> Optional[str]:
+        if not value or not isinstance(value, str):
+            return None
+        value = ORDINAL_SUFFIX.sub("", value.replace(",", " ")).strip()
+        value = " ".join(value.split())
+        for fmt in DATE_FORMATS:
+            try:
+                return datetime.strptime(value, fmt).strftime("%Y-%m-%d")
+            except ValueError:
+                continue
+        return None
+
+    def normalize(self, raw_fields: dict):
+        """
+        Return (resolved fields, names of the fields that could not be resolved locally).
+        Missing optional fields take the same defaults the LLM prompt uses.
+        """
+        resolved = {}
+        unresolved = []
+
+        def put(field, value):
+            if value is None:
+                unresolved.append(field)
+            else:
+                resolved[field] = value
+
+        put("departure_airport", self.resolve_airport(raw_fields.get("departure_airport")))
+        put("arrival_airport", self.resolve_airport(raw_fields.get("arrival_airport")))
+        put("departure_date", self.resolve_date(raw_fields.get("departure_date")))
+        put("airline", self.resolve_airline(raw_fields.get("airline")))
+
+        cabin = raw_fields.get("cabin_class")
+        put("cabin_class", CABIN_CLASSES.get(normalize_name(cabin)) if cabin else DEFAULTS["cabin_class"])
+
+        currency = (raw_fields.get("currency") or DEFAULTS["currency"]).strip()
+        put("currency", currency.upper() if re.fullmatch(r"[A-Za-z]{3}", currency) else None)
+
+        for field in ("adults", "children", "infants"):
+            value = raw_fields.get(field)
+            if value is None:
+                resolved[field] = DEFAULTS[field]
+                continue
+            try:
+                count = int(value)
+            except (TypeError, ValueError):
+                count = -1
+            put(field, count if count >= 0 else None)
+
+        return resolved, unresolved
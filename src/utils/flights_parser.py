@@ -8,6 +8,8 @@ from sympy.physics.units import temperature
 from openai import OpenAI
 
 from src.models.flights_model import FlightsListSearchRequest, FlightInfoRequest
+from src.utils import metrics
+from src.utils.flight_normalizer import LocalFlightNormalizer
 
 load_dotenv()
 OPEN_AI_KEY = os.getenv('OPENAI_API_KEY_OTHER')
@@ -17,11 +19,52 @@ class FlightQueryParser:
         # Use OpenAI model
         self.client = OpenAI(api_key=OPEN_AI_KEY)
         self.model = "gpt-4o-mini"
+        self.local_normalizer = LocalFlightNormalizer()
 
     def normalize_flight_input(self, raw_fields: dict) -> FlightsListSearchRequest:
+        return self.normalize_flight_inputs([raw_fields])[0]
+
+    def normalize_flight_inputs(self, raw_fields_list: list) -> list[FlightsListSearchRequest]:
+        """
+        Normalize several searches together: each one first goes through the bundled
+        airport / airline tables, and all that still have unresolved fields share one LLM call.
+        """
+        local_results = [self.local_normalizer.normalize(raw_fields) for raw_fields in raw_fields_list]
+        pending = [i for i, (_, unresolved) in enumerate(local_results) if unresolved]
+        metrics.increment("flight_normalizer.local", len(raw_fields_list) - len(pending))
+
+        model_outputs = {}
+        if pending:
+            metrics.increment("flight_normalizer.llm", len(pending))
+            print("Fields not resolved locally:", [local_results[i][1] for i in pending])
+            outputs = self._llm_normalize([raw_fields_list[i] for i in pending])
+            model_outputs = dict(zip(pending, outputs))
+
+        normalized = []
+        for i, (raw_fields, (resolved, unresolved)) in enumerate(zip(raw_fields_list, local_results)):
+            if not unresolved:
+                normalized.append(FlightsListSearchRequest(**resolved))
+            else:
+                normalized.append(self._merge_model_output(model_outputs.get(i, {}), raw_fields, resolved))
+        return normalized
+
+    def _llm_normalize(self, raw_fields_list: list) -> list:
+        """
+        One model call for all inputs; returns one (possibly empty) dict per input.
+        """
+        if len(raw_fields_list) == 1:
+            inputs = raw_fields_list[0]
+            output_rule = "- Output must be valid JSON ONLY — no Python dict, no extra text."
+        else:
+            inputs = json.dumps(raw_fields_list, default=str)
+            output_rule = (
+                '- Output must be valid JSON ONLY: {"routes": [...]} with one object per input, '
+                "in the same order — no Python dict, no extra text."
+            )
+
         prompt = f"""
         You are a flight input normalization model. Reformat these flight search parameters for a valid Amadeus API input parameters.
-        {raw_fields}
+        {inputs}
 
         ### RULES
         - The date can appear in many forms (e.g., "January 2nd 2026", "02/01/2026", "2026-01-02"). 
@@ -35,7 +78,7 @@ class FlightQueryParser:
           - children: 0
           - infants: 0
           - airline: ""
-        - Output must be valid JSON ONLY — no Python dict, no extra text.
+        {output_rule}
         """
 
         response = self.client.chat.completions.create(
@@ -51,11 +94,20 @@ class FlightQueryParser:
         print("Model output", result)
 
         try:
-            result_dict = json.loads(result)
+            result_json = json.loads(result)
         except json.JSONDecodeError:
             print("Error parsing flight input, falling back to defaults")
-            result_dict = {}
+            result_json = {}
+
+        if len(raw_fields_list) == 1:
+            return [result_json if isinstance(result_json, dict) else {}]
+        routes = result_json.get("routes", []) if isinstance(result_json, dict) else []
+        if len(routes) != len(raw_fields_list):
+            print("Model returned", len(routes), "routes for", len(raw_fields_list), "inputs, falling back to defaults")
+            routes = [{}] * len(raw_fields_list)
+        return [route if isinstance(route, dict) else {} for route in routes]
 
+    def _merge_model_output(self, result_dict: dict, raw_fields: dict, resolved: dict) -> FlightsListSearchRequest:
         normalized_result_dict = {
             "departure_airport": result_dict.get('departureAirport', raw_fields.get('departure_airport', '')).upper(),
             "arrival_airport": result_dict.get('arrivalAirport', raw_fields.get('arrival_airport', '')).upper(),
@@ -68,6 +120,8 @@ class FlightQueryParser:
             "airline": result_dict.get('airline', raw_fields.get('airline', ''))
         }
 
+        # fields resolved from the bundled tables win over the model output
+        normalized_result_dict.update(resolved)
         return FlightsListSearchRequest(**normalized_result_dict)
 
 
@@ -0,0 +1,22 @@
+import threading
+from collections import defaultdict
+
+# Process-wide counters (cache hits, fast-path usage, ...), exposed through GET /metrics.
+# Each uvicorn worker keeps its own counts.
+_counters = defaultdict(int)
+_lock = threading.Lock()
+
+
+def increment(name: str, amount: int = 1):
+    with _lock:
+        _counters[name] += amount
+
+
+def get(name: str) -> int:
+    with _lock:
+        return _counters.get(name, 0)
+
+
+def snapshot() -> dict:
+    with _lock:
+        return dict(sorted(_counters.items()))
@@ -0,0 +1,119 @@
+import numpy as np
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores, best first, using argpartition
+    so only the selected k are fully sorted.
+    """
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if k < len(scores):
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(len(scores))
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+class ExactIndex:
+    """
+    Brute-force inner-product search over a row-normalized float32 matrix.
+    """
+
+    approximate = False
+
+    def __init__(self, matrix: np.ndarray):
+        self.matrix = matrix
+
+    def search(self, query: np.ndarray, k: int):
+        """
+        Return (row ids, scores) of the k best rows, best first.
+        """
+        scores = self.matrix @ query
+        ids = top_k_indices(scores, k)
+        return ids, scores[ids]
+
+
+class IVFIndex:
+    """
+    Inverted-file index: rows are clustered around `n_lists` centroids (spherical k-means)
+    and a search only scores the rows of the `n_probe` lists closest to the query.
+    Each list is stored as a contiguous block of a reordered copy of the matrix.
+    """
+
+    approximate = True
+
+    def __init__(self, matrix: np.ndarray, n_lists: int = None, n_probe: int = 16,
+                 train_iters: int = 10, train_size: int = 50_000, seed: int = 0):
+        n = len(matrix)
+        self.n_lists = max(1, min(n, n_lists or int(np.sqrt(n))))
+        self.n_probe = n_probe
+        rng = np.random.default_rng(seed)
+
+        sample = matrix
+        if n > train_size:
+            sample = matrix[rng.choice(n, train_size, replace=False)]
+        self.centroids = _spherical_kmeans(sample, self.n_lists, train_iters, rng)
+
+        assignments = _assign(matrix, self.centroids)
+        order = np.argsort(assignments, kind="stable")
+        self.row_ids = order                       # position in reordered matrix -> original row
+        self.vectors = np.ascontiguousarray(matrix[order])
+        counts = np.bincount(assignments, minlength=self.n_lists)
+        self.offsets = np.concatenate(([0], np.cumsum(counts)))
+
+    def search(self, query: np.ndarray, k: int, n_probe: int = None):
+        """
+        Return (row ids, scores) of the k best rows found in the probed lists, best first.
+        """
+        n_probe = min(n_probe or self.n_probe, self.n_lists)
+        lists = top_k_indices(self.centroids @ query, n_probe)
+
+        positions = [np.arange(self.offsets[i], self.offsets[i + 1]) for i in lists]
+        scores = [self.vectors[self.offsets[i]:self.offsets[i + 1]] @ query for i in lists]
+        positions = np.concatenate(positions)
+        scores = np.concatenate(scores)
+
+        best = top_k_indices(scores, k)
+        return self.row_ids[positions[best]], scores[best]
+
+
+def build_index(matrix: np.ndarray, kind: str = "auto", ann_min_size: int = 20_000, n_probe: int = 16):
+    """
+    Build the vector index used for candidate retrieval.
+    kind is "exact", "ivf", or "auto" (IVF once the catalog has ann_min_size rows).
+    """
+    if kind == "ivf" or (kind == "auto" and len(matrix) >= ann_min_size):
+        return IVFIndex(matrix, n_probe=n_probe)
+    if kind not in ("auto", "exact"):
+        raise ValueError(f"Unknown vector index kind: {kind}")
+    return ExactIndex(matrix)
+
+
+def _spherical_kmeans(vectors: np.ndarray, k: int, iters: int, rng) -> np.ndarray:
+    centroids = vectors[rng.choice(len(vectors), k, replace=False)].copy()
+    for _ in range(iters):
+        assignments = _assign(vectors, centroids)
+        order = np.argsort(assignments, kind="stable")
+        counts = np.bincount(assignments, minlength=k)
+        empty = counts == 0
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        sums = np.zeros_like(centroids)
+        sums[~empty] = np.add.reduceat(vectors[order], starts[~empty], axis=0)
+        # re-seed empty clusters with random points
+        sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()))]
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        centroids = (sums / norms).astype(np.float32)
+    return centroids
+
+
+def _assign(vectors: np.ndarray, centroids: np.ndarray, chunk: int = 8192) -> np.ndarray:
+    """
+    Index of the closest centroid (by inner product) for every row, computed in chunks.
+    """
+    out = np.empty(len(vectors), dtype=np.intp)
+    for start in range(0, len(vectors), chunk):
+        out[start:start + chunk] = np.argmax(vectors[start:start + chunk] @ centroids.T, axis=1)
+    return out
@@ -0,0 +1,25 @@
+from src.utils.airport_resolver import AirportResolver
+
+AIRPORTS = [
+    {"iata": "YUL", "name": "Montréal-Trudeau International Airport", "city": "Montreal", "country": "CA"},
+    {"iata": "JFK", "name": "John F. Kennedy International Airport", "city": "New York", "country": "US"},
+    {"iata": "LGA", "name": "LaGuardia Airport", "city": "New York", "country": "US"},
+    {"iata": "CDG", "name": "Paris Charles de Gaulle Airport", "city": "Paris", "country": "FR"},
+]
+resolver = AirportResolver(AIRPORTS)
+
+
+def test_exact_lookups():
+    assert resolver.resolve("yul") == "YUL"
+    assert resolver.resolve("Montréal") == "YUL"
+    assert resolver.resolve("new york") == "JFK"  # first airport listed is the main one
+    assert resolver.resolve("LaGuardia Airport") == "LGA"
+    assert resolver.exact("Montrael") is None
+    assert resolver.exact(None) is None
+
+
+def test_prefix_and_typo_lookups():
+    assert resolver.prefix("mont") == ["YUL"]
+    assert resolver.resolve("Montrael") == "YUL"
+    assert resolver.fuzzy("Pariss")[0][0] == "CDG"
+    assert resolver.resolve("somewhere warm") is None
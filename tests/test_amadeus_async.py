@@ -0,0 +1,23 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+from src.utils.amadeus_async import AsyncAmadeus
+
+
+def slow_get(**params):
+    time.sleep(0.2)
+    return params
+
+
+def test_concurrent_calls_overlap():
+    client = SimpleNamespace(shopping=SimpleNamespace(flight_offers_search=SimpleNamespace(get=slow_get)))
+    amadeus = AsyncAmadeus(client, max_workers=4)
+
+    async def search_all():
+        return await asyncio.gather(*[amadeus.flight_offers_search(max=i) for i in range(4)])
+
+    start = time.perf_counter()
+    results = asyncio.run(search_all())
+    assert results == [{"max": i} for i in range(4)]
+    assert time.perf_counter() - start < 0.6
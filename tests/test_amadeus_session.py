@@ -0,0 +1,45 @@
+import time
+from types import SimpleNamespace
+
+from src.utils.amadeus_session import SharedAccessToken
+
+
+class FakeClient:
+    host = "test.api.amadeus.com"
+    client_id = "id"
+    client_secret = "secret"
+
+    def __init__(self):
+        self.fetches = 0
+
+    def _unauthenticated_request(self, verb, path, params):
+        self.fetches += 1
+        return SimpleNamespace(result={"access_token": f"token-{self.fetches}", "expires_in": 1799})
+
+
+def test_workers_share_one_token(tmp_path):
+    path = str(tmp_path / "token.json")
+    client = FakeClient()
+    worker_a = SharedAccessToken(client, path)
+    worker_b = SharedAccessToken(client, path)
+
+    assert worker_a._bearer_token() == "Bearer token-1"
+    assert worker_b._bearer_token() == "Bearer token-1"
+    assert client.fetches == 1
+
+
+def test_refresh_ahead_renews_once_for_all_workers(tmp_path):
+    path = str(tmp_path / "token.json")
+    client = FakeClient()
+    worker_a = SharedAccessToken(client, path, refresh_ahead=300)
+    worker_b = SharedAccessToken(client, path, refresh_ahead=300)
+    worker_a.token()
+    worker_b.token()
+
+    # the shared token is 100s from expiry: both refreshers wake up, only the first negotiates
+    worker_a.expires_at = worker_b.expires_at = int(time.time()) + 100
+    worker_a._write()
+    assert worker_a.seconds_until_refresh() < 0
+    assert worker_a.refresh(min_validity=300) == "token-2"
+    assert worker_b.refresh(min_validity=300) == "token-2"
+    assert client.fetches == 2
@@ -0,0 +1,96 @@
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from src.scripts import migrate_booked_flights as migration
+from src.services import flights_service
+from src.services.flights_service import FlightsService, _decode_cursor, _encode_cursor
+
+START = datetime(2026, 1, 1, 12, 0)
+USER = {"email": "ana@example.com"}
+
+
+def booking(booking_id: str, booked_at: datetime, status: str = "Confirmed") -> dict:
+    return {
+        "_id": booking_id, "booked_at": booked_at, "booking_status": status, "user_email": USER["email"],
+        "segments": [{"flight_number": "AC870", "carrier_code": "AC", "departure_airport": "YUL",
+                      "arrival_airport": "CDG", "departure_time": "2026-02-01T18:00:00",
+                      "arrival_time": "2026-02-02T07:00:00", "duration": "PT7H"}],
+        "price": {"total": "900.00", "currency": "CAD", "grand_total": "900.00"},
+    }
+
+
+def matches(doc: dict, query: dict) -> bool:
+    for field, condition in query.items():
+        if field == "$or":
+            if not any(matches(doc, sub) for sub in condition):
+                return False
+        elif isinstance(condition, dict):
+            if not doc[field] < condition["$lt"]:
+                return False
+        elif doc[field] != condition:
+            return False
+    return True
+
+
+class FakeFlights:
+    """find().sort().limit() over a list, enough for the booking history query."""
+
+    def __init__(self, docs):
+        self.docs = docs
+
+    def find(self, query, projection=None):
+        found = [d for d in self.docs if matches(d, query)]
+        cursor = SimpleNamespace()
+        cursor.sort = lambda keys: SimpleNamespace(
+            limit=lambda n: sorted(found, key=lambda d: (d["booked_at"], d["_id"]), reverse=True)[:n]
+        )
+        return cursor
+
+
+def test_cursor_round_trip():
+    assert _decode_cursor(_encode_cursor({"booked_at": START, "_id": "b|1"})) == (START, "b|1")
+
+
+@pytest.mark.parametrize("cursor", ["not base64!", "bm90LWEtY3Vyc29y", "é"])
+def test_invalid_cursor(cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        _decode_cursor(cursor)
+
+
+def test_pages_break_ties_on_booked_at_by_id(monkeypatch):
+    # three bookings share a booked_at, so the page boundary falls inside the tie
+    docs = [booking("a", START), booking("b", START), booking("c", START),
+            booking("d", START - timedelta(days=1)), booking("e", START, status="Cancelled")]
+    monkeypatch.setattr(flights_service, "flights_collection", FakeFlights(docs))
+    service = FlightsService.__new__(FlightsService)  # no Amadeus client needed for history
+
+    seen, cursor = [], None
+    while True:
+        page = asyncio.run(service.get_user_booked_flights(USER, limit=2, cursor=cursor))
+        seen += [b.booking_id for b in page.booked_flights]
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert seen == ["c", "b", "a", "d"]
+
+
+def test_migration_copies_embedded_bookings(monkeypatch):
+    written = []
+    users = SimpleNamespace(find=lambda query, projection: [
+        {"email": USER["email"], "booked_flights": [booking("a", START), {"_id": "b", "booking_status": "Cancelled"}]},
+    ])
+    flights = SimpleNamespace(bulk_write=lambda ops, ordered: written.extend(ops))
+    monkeypatch.setattr(migration, "users_collection", users)
+    monkeypatch.setattr(migration, "flights_collection", flights)
+    monkeypatch.setattr(migration, "ensure_flight_indexes", lambda: None)
+
+    migration.migrate_booked_flights(batch_size=1, dry_run=True)
+    assert written == []
+
+    migration.migrate_booked_flights(batch_size=1)
+    assert [op._filter for op in written] == [{"_id": "a"}, {"_id": "b"}]
+    assert all(op._doc["$set"]["user_email"] == USER["email"] for op in written)
+    assert "booked_at" in written[1]._doc["$set"]
@@ -0,0 +1,44 @@
+from types import SimpleNamespace
+
+from src.utils.bulk_upsert import HASH_FIELD, bulk_upsert, content_hash
+
+
+class FakeCollection:
+    """Just enough of a pymongo collection for bulk_upsert, keyed by hotel_id."""
+
+    def __init__(self):
+        self.docs = {}
+        self.batches = []
+
+    def find(self, query, projection):
+        keys = {q["hotel_id"] for q in query["$or"]}
+        return [doc for key, doc in self.docs.items() if key in keys]
+
+    def bulk_write(self, ops, ordered=True):
+        self.batches.append((len(ops), ordered))
+        inserted = modified = 0
+        for op in ops:
+            key = op._filter["hotel_id"]
+            inserted += key not in self.docs
+            modified += key in self.docs
+            self.docs[key] = {**self.docs.get(key, {}), **op._doc["$set"]}
+        return SimpleNamespace(upserted_count=inserted, modified_count=modified)
+
+
+def test_content_hash_ignores_key_order_and_excluded_fields():
+    assert content_hash({"a": 1, "b": 2}) == content_hash({"b": 2, "a": 1})
+    assert content_hash({"a": 1, "ts": 1}, exclude=("ts",)) == content_hash({"a": 1, "ts": 2}, exclude=("ts",))
+    assert content_hash({"a": 1}) != content_hash({"a": 2})
+
+
+def test_unchanged_documents_are_skipped():
+    collection = FakeCollection()
+    hotels = [{"hotel_id": str(i), "price": 100 + i} for i in range(5)]
+
+    assert bulk_upsert(collection, hotels, ["hotel_id"], batch_size=2) == {"inserted": 5, "modified": 0, "skipped": 0}
+    assert collection.batches == [(2, False), (2, False), (1, False)]
+    assert collection.docs["0"][HASH_FIELD] == content_hash(hotels[0])
+
+    hotels[3] = {"hotel_id": "3", "price": 80}
+    assert bulk_upsert(collection, hotels, ["hotel_id"]) == {"inserted": 0, "modified": 1, "skipped": 4}
+    assert collection.docs["3"]["price"] == 80
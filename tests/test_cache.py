@@ -0,0 +1,50 @@
+from src.utils.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_hit_and_miss_counters():
+    cache = TTLCache("test_cache", maxsize=2, ttl=60)
+    assert cache.get("a") is None
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_lru_eviction():
+    cache = TTLCache("test_cache", maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" is now the least recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = TTLCache("test_cache", maxsize=2, ttl=60, clock=clock)
+    cache.set("a", 1)
+    clock.now += 30
+    assert cache.get_with_age("a") == (1, 30)
+    clock.now += 31
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = TTLCache("test_cache", maxsize=2, ttl=60, path=path)
+    cache.set("query", [0.1, 0.2])
+
+    restarted = TTLCache("test_cache", maxsize=2, ttl=60, path=path)
+    assert restarted.get("query") == [0.1, 0.2]
+    assert len(restarted) == 1  # promoted back into memory
@@ -0,0 +1,129 @@
+import numpy as np
+
+from src.utils.destination_ranker import DestinationRanker, top_k_indices, travel_months_mask
+
+
+def make_ranker():
+    destinations = [
+        {"name": "Bali", "average_cost": 1200.0},
+        {"name": "Kyoto", "average_cost": 2000.0},
+        {"name": "Cancún", "average_cost": None},
+    ]
+    vectors = [[1.0, 0.0], [0.8, 0.6], [0.0, 2.0]]
+    return DestinationRanker(destinations, vectors)
+
+
+def test_rank_orders_by_cosine_similarity():
+    ranker = make_ranker()
+    results = ranker.rank([1.0, 0.1], limit=3)
+    assert [d["name"] for d in results] == ["Bali", "Kyoto", "Cancún"]
+
+
+def test_rank_returns_copies():
+    ranker = make_ranker()
+    results = ranker.rank([1.0, 0.0], limit=1)
+    results[0]["name"] = "changed"
+    assert ranker.destinations[0]["name"] == "Bali"
+
+
+def test_budget_penalty_matches_loop_formula():
+    ranker = make_ranker()
+    scores = ranker.scores([0.8, 0.6], budget=2000)
+    # Kyoto is an exact match and at budget, Bali pays 0.3 * 800 / 2000
+    assert np.isclose(scores[1], 1.0)
+    assert np.isclose(scores[0], 0.8 * (1 - 0.3 * 800 / 2000))
+    # No average_cost means no penalty
+    assert np.isclose(scores[2], 0.6)
+
+
+def test_top_k_indices():
+    scores = np.array([0.1, 0.9, 0.5, 0.7])
+    assert list(top_k_indices(scores, 2)) == [1, 3]
+    assert list(top_k_indices(scores, 10)) == [1, 3, 2, 0]
+
+
+def test_empty_catalog():
+    ranker = DestinationRanker([], [])
+    assert ranker.rank([1.0, 0.0], limit=5) == []
+
+
+def test_upsert_and_remove_in_place():
+    ranker = make_ranker()
+    for i, d in enumerate(ranker.destinations):
+        d["_id"] = str(i)
+    ranker = DestinationRanker(ranker.destinations, ranker.matrix)
+
+    ranker.upsert({"_id": "3", "name": "Reykjavik", "average_cost": 2300.0}, [-1.0, 0.0])
+    assert len(ranker) == 4
+    assert ranker.rank([-1.0, 0.0], limit=1)[0]["name"] == "Reykjavik"
+
+    ranker.upsert({"_id": "0", "name": "Bali (updated)", "average_cost": 1200.0}, [0.0, -1.0])
+    assert ranker.rank([0.0, -1.0], limit=1)[0]["name"] == "Bali (updated)"
+
+    assert ranker.remove("3")
+    assert not ranker.remove("3")
+    assert len(ranker) == 3
+    assert "Reykjavik" not in [d["name"] for d in ranker.rank([-1.0, 0.0], limit=10)]
+
+
+def test_changes_are_visible_with_an_approximate_index():
+    rng = np.random.default_rng(1)
+    vectors = rng.standard_normal((400, 8)).astype(np.float32)
+    destinations = [{"_id": str(i), "name": f"dest-{i}"} for i in range(len(vectors))]
+    ranker = DestinationRanker(destinations, vectors, index_kind="ivf")
+
+    target = rng.standard_normal(8).astype(np.float32)
+    ranker.upsert({"_id": "new", "name": "new"}, target)
+    assert ranker.rank(target, limit=1)[0]["name"] == "new"
+
+    ranker.remove("new")
+    ranker.rebuild_index()
+    assert "new" not in [d["name"] for d in ranker.rank(target, limit=5)]
+
+
+def test_travel_months_mask():
+    assert travel_months_mask("April–October") == 0b000001111111000
+    assert travel_months_mask("November–March") == 0b110000000111
+    assert travel_months_mask("Year-round") == 0b111111111111
+    assert travel_months_mask(None) == 0
+
+
+def test_hard_filters_run_before_scoring():
+    destinations = [
+        {"_id": "1", "name": "Bali", "country": "Indonesia", "tags": ["beach", "nightlife"],
+         "best_time_to_visit": "April–October", "average_cost": 1200.0},
+        {"_id": "2", "name": "Cancún", "country": "Mexico", "tags": ["beach", "party", "nightlife"],
+         "best_time_to_visit": "December–April", "average_cost": 1400.0},
+        {"_id": "3", "name": "Kyoto", "country": "Japan", "tags": ["culture"],
+         "best_time_to_visit": "March–May, October–November", "average_cost": 2000.0},
+    ]
+    ranker = DestinationRanker(destinations, [[1.0, 0.0], [0.9, 0.1], [0.0, 1.0]])
+
+    def names(**filters):
+        return [d["name"] for d in ranker.rank([1.0, 0.0], limit=5, filters=filters)]
+
+    assert names(country="mexico") == ["Cancún"]
+    assert names(tags=["Beach", "nightlife"]) == ["Bali", "Cancún"]
+    assert names(max_cost=1300) == ["Bali"]
+    assert names(min_cost=1300, max_cost=2500) == ["Cancún", "Kyoto"]
+    assert names(month=1) == ["Cancún"]
+    assert names(month=10, tags=["culture"]) == ["Kyoto"]
+    assert names(country="Atlantis") == []
+
+    ranker.upsert({"_id": "1", "name": "Bali", "country": "Indonesia", "tags": ["wellness"],
+                   "best_time_to_visit": "April–October", "average_cost": 1200.0}, [1.0, 0.0])
+    assert names(tags=["beach"]) == ["Cancún"]
+
+
+def test_rank_many_matches_single_queries():
+    ranker = make_ranker()
+    queries = [[1.0, 0.1], [0.8, 0.6], [0.0, 1.0]]
+    limits = [3, 2, 1]
+    budgets = [None, 2000, 1500]
+    batch = ranker.rank_many(queries, limits, budgets)
+    single = [ranker.rank(q, limit, budget) for q, limit, budget in zip(queries, limits, budgets)]
+    assert [[d["name"] for d in r] for r in batch] == [[d["name"] for d in r] for r in single]
+
+
+def test_rank_many_with_no_queries():
+    assert make_ranker().rank_many([], limits=[]) == []
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from src.services import destination_service
+from src.services.destination_service import (
+    EmbeddingProvider,
+    HashingEmbeddingProvider,
+    OpenAIEmbeddingProvider,
+    get_embedding_provider,
+)
+
+
+def test_provider_interface_is_abstract():
+    with pytest.raises(TypeError):
+        EmbeddingProvider()
+
+
+def test_hashing_embeddings_are_deterministic_and_normalized():
+    provider = HashingEmbeddingProvider(dim=64)
+    first, second = provider.embed(["quiet beach with coral reefs", "quiet beach with coral reefs"])
+    assert first.shape == (64,)
+    assert np.array_equal(first, second)
+    assert np.isclose(np.linalg.norm(first), 1.0)
+    assert provider.model_name == "local-hashing-64"
+    assert not np.any(HashingEmbeddingProvider().embed(["the and of"])[0])  # stopwords only
+
+
+def test_hashing_embeddings_rank_similar_texts_higher():
+    query, similar, unrelated = HashingEmbeddingProvider().embed([
+        "sunny beach resort with snorkeling",
+        "beach resort for snorkeling and diving",
+        "historic temples and mountain hiking",
+    ])
+    assert query @ similar > query @ unrelated
+
+
+def test_get_embedding_provider(monkeypatch):
+    monkeypatch.setattr(destination_service.settings, "EMBEDDING_PROVIDER", "local")
+    monkeypatch.setattr(destination_service.settings, "LOCAL_EMBEDDING_DIM", 128)
+    provider = get_embedding_provider()
+    assert isinstance(provider, HashingEmbeddingProvider)
+    assert provider.dim == 128
+
+    monkeypatch.setenv("OPENAI_API_KEY_OTHER", "test")
+    monkeypatch.setattr(destination_service.settings, "EMBEDDING_PROVIDER", "openai")
+    assert isinstance(get_embedding_provider(), OpenAIEmbeddingProvider)
+
+    monkeypatch.setattr(destination_service.settings, "EMBEDDING_PROVIDER", "word2vec")
+    with pytest.raises(ValueError, match="Unknown embedding provider"):
+        get_embedding_provider()
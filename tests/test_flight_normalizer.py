@@ -0,0 +1,44 @@
+from src.utils.flight_normalizer import LocalFlightNormalizer
+
+normalizer = LocalFlightNormalizer()
+
+
+def test_codes_and_iso_dates_resolve_locally():
+    resolved, unresolved = normalizer.normalize({
+        "departure_airport": "yul", "arrival_airport": "CDG", "departure_date": "2026-01-02",
+        "cabin_class": "Economy", "currency": "cad", "adults": 1, "children": 0, "infants": 0, "airline": None,
+    })
+    assert unresolved == []
+    assert resolved == {
+        "departure_airport": "YUL", "arrival_airport": "CDG", "departure_date": "2026-01-02",
+        "cabin_class": "Economy", "currency": "CAD", "adults": 1, "children": 0, "infants": 0, "airline": "",
+    }
+
+
+def test_city_and_airline_names():
+    resolved, unresolved = normalizer.normalize({
+        "departure_airport": "Montréal", "arrival_airport": "new york", "departure_date": "January 2nd, 2026",
+        "cabin_class": "premium economy", "airline": "Air Algérie",
+    })
+    assert unresolved == []
+    assert resolved["departure_airport"] == "YUL"
+    assert resolved["arrival_airport"] == "JFK"
+    assert resolved["departure_date"] == "2026-01-02"
+    assert resolved["cabin_class"] == "Premium_Economy"
+    assert resolved["airline"] == "AH"
+
+
+def test_ambiguous_or_unknown_input_is_left_to_the_llm():
+    _, unresolved = normalizer.normalize({
+        "departure_airport": "my hometown", "arrival_airport": "ZZZ", "departure_date": "02/01/2026",
+        "airline": "cheapest one",
+    })
+    assert unresolved == ["departure_airport", "arrival_airport", "departure_date", "airline"]
+
+
+def test_near_misses_are_not_guessed():
+    # prefix / typo matches land on the wrong city ("Portland" -> Porto), so only exact names resolve
+    for city in ("Portland", "Charlottetown", "London Ontario", "Montrael"):
+        _, unresolved = normalizer.normalize({"departure_airport": city, "arrival_airport": "CDG",
+                                              "departure_date": "2026-01-02"})
+        assert unresolved == ["departure_airport"], city
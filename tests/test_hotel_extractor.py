@@ -0,0 +1,57 @@
+from datetime import date
+
+from src.services.nlp_hotel_service import rule_extract_hotel_params
+
+YEAR = date.today().year
+
+
+def test_plain_request_is_fully_extracted():
+    params = rule_extract_hotel_params("hotels in Paris from March 10 to March 15 for 2 adults")
+    assert params == {"q": "Paris", "check_in_date": f"{YEAR}-03-10", "check_out_date": f"{YEAR}-03-15",
+                      "adults": 2, "children": 0}
+
+
+def test_multi_word_city_and_short_range():
+    params = rule_extract_hotel_params("Hotels in Los Angeles from July 4th to 8th for two adults and 1 child")
+    assert params["q"] == "Los-Angeles"
+    assert params["check_in_date"] == f"{YEAR}-07-04"
+    assert params["check_out_date"] == f"{YEAR}-07-08"
+    assert (params["adults"], params["children"]) == (2, 1)
+
+
+def test_unclear_fields_are_left_for_the_llm():
+    params = rule_extract_hotel_params("somewhere warm next weekend for 2 adults")
+    assert "q" not in params
+    assert "check_in_date" not in params
+    assert params["adults"] == 2
+
+
+def test_landmarks_and_several_locations_leave_q_to_the_llm():
+    params = rule_extract_hotel_params("hotel near Eiffel Tower in Paris from May 1 to May 4 for 2 adults")
+    assert params["q"] == "Paris"
+
+    params = rule_extract_hotel_params("hotel in Old Town in Prague from May 1 to May 4 for 2 adults")
+    assert "q" not in params
+    assert params["adults"] == 2
+
+
+def test_city_stops_at_punctuation_months_and_single_letters():
+    for text in ("I need a hotel in Rome. From May 1 to May 4 for 2 adults",
+                 "a hotel in Rome I can book from May 1 to May 4 for 2 adults",
+                 "a hotel in Rome June 1 to June 4 for 2 adults"):
+        assert rule_extract_hotel_params(text)["q"] == "Rome", text
+    assert "q" not in rule_extract_hotel_params("hotel in St. Louis from May 1 to 4 for 1 adult")
+
+
+def test_end_date_takes_the_year_of_the_start():
+    params = rule_extract_hotel_params("hotels in Paris from 1 May 2028 to 4 May for 2 adults")
+    assert (params["check_in_date"], params["check_out_date"]) == ("2028-05-01", "2028-05-04")
+
+    params = rule_extract_hotel_params("hotels in Paris from May 4 2028 to May 1 for 2 adults")
+    assert "check_in_date" not in params
+
+
+def test_guests_are_left_to_the_llm():
+    params = rule_extract_hotel_params("hotels in Paris from May 1 to May 4 for 4 guests including 2 kids")
+    assert "adults" not in params
+    assert "children" not in params
@@ -0,0 +1,103 @@
+import pytest
+from bson import ObjectId
+
+from src.services import destination_service
+from src.services.destination_service import create_recommendation, regenerate_recommendation
+
+USER_ID = str(ObjectId())
+
+
+class FakeRecommendations:
+    """find_one / insert_one / update_one over a list, enough for the reuse lookups."""
+
+    def __init__(self):
+        self.docs = []
+
+    def _matches(self, doc, query):
+        for field, condition in query.items():
+            if isinstance(condition, dict):
+                if not doc.get(field) >= condition["$gte"]:
+                    return False
+            elif doc.get(field) != condition:
+                return False
+        return True
+
+    def find_one(self, query, sort=None):
+        found = [doc for doc in self.docs if self._matches(doc, query)]
+        found.sort(key=lambda doc: doc["created_at"], reverse=True)
+        return dict(found[0]) if found else None
+
+    def insert_one(self, doc):
+        doc["_id"] = ObjectId()
+        self.docs.append(dict(doc))
+        return type("InsertResult", (), {"inserted_id": doc["_id"]})
+
+    def update_one(self, query, update):
+        for doc in self.docs:
+            if self._matches(doc, query):
+                doc.update(update["$set"])
+
+
+@pytest.fixture
+def recs(monkeypatch):
+    state = {"catalog_version": "v1", "computed": 0}
+
+    def recommend(query, limit, user_prefs):
+        state["computed"] += 1
+        return [{"name": f"{query} #{state['computed']}"}]
+
+    collection = FakeRecommendations()
+    monkeypatch.setattr(destination_service, "recommendations_collection", collection)
+    monkeypatch.setattr(destination_service, "get_user_by_id", lambda user_id: {"preferences": {"budget": 1500}})
+    monkeypatch.setattr(destination_service, "recommend_destinations", recommend)
+    monkeypatch.setattr(destination_service, "_catalog_version", lambda: state["catalog_version"])
+    monkeypatch.setattr(destination_service.settings, "RECOMMENDATION_REUSE_WINDOW", 3600)
+    state["collection"] = collection
+    return state
+
+
+def test_same_query_is_reused(recs):
+    first = create_recommendation(USER_ID, "Beach  holidays", limit=3)
+    second = create_recommendation(USER_ID, "beach holidays", limit=3)
+    assert second["_id"] == first["_id"]
+    assert second["results"] == first["results"]
+    assert recs["computed"] == 1
+
+    create_recommendation(USER_ID, "beach holidays", limit=5)  # other limit, other fingerprint
+    assert recs["computed"] == 2
+
+
+def test_catalog_change_forces_a_recompute(recs):
+    first = create_recommendation(USER_ID, "beach holidays")
+    recs["catalog_version"] = "v2"
+    second = create_recommendation(USER_ID, "beach holidays")
+    assert second["_id"] != first["_id"]
+    assert recs["computed"] == 2
+
+
+def test_zero_window_disables_reuse(recs, monkeypatch):
+    monkeypatch.setattr(destination_service.settings, "RECOMMENDATION_REUSE_WINDOW", 0)
+    create_recommendation(USER_ID, "beach holidays")
+    create_recommendation(USER_ID, "beach holidays")
+    assert recs["computed"] == 2
+
+
+def test_regenerate_with_the_same_query_returns_the_recommendation_unchanged(recs):
+    rec = create_recommendation(USER_ID, "beach holidays")
+    stored = dict(recs["collection"].docs[0])
+
+    again = regenerate_recommendation(rec["_id"], "Beach holidays")
+    assert again["_id"] == rec["_id"]
+    assert again["results"] == rec["results"]
+    assert recs["collection"].docs[0] == stored
+    assert recs["computed"] == 1
+
+
+def test_regenerate_reuses_results_of_another_matching_recommendation(recs):
+    beach = create_recommendation(USER_ID, "beach holidays")
+    ski = create_recommendation(USER_ID, "ski trip")
+
+    updated = regenerate_recommendation(ski["_id"], "beach holidays")
+    assert updated["_id"] == ski["_id"]
+    assert updated["results"] == beach["results"]
+    assert recs["computed"] == 2
@@ -0,0 +1,34 @@
+import numpy as np
+
+from src.utils.destination_ranker import DestinationRanker
+from src.utils.vector_index import ExactIndex, IVFIndex, build_index
+
+
+def random_unit_vectors(n, dim, seed=0):
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((n, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def test_ivf_probing_every_list_matches_exact_search():
+    vectors = random_unit_vectors(2000, 32)
+    query = vectors[7]
+    exact_ids, _ = ExactIndex(vectors).search(query, 10)
+    ivf = IVFIndex(vectors, n_lists=20)
+    ivf_ids, _ = ivf.search(query, 10, n_probe=ivf.n_lists)
+    assert list(ivf_ids) == list(exact_ids)
+    assert ivf_ids[0] == 7
+
+
+def test_build_index_picks_ivf_for_large_catalogs():
+    vectors = random_unit_vectors(500, 8)
+    assert isinstance(build_index(vectors, "auto", ann_min_size=1000), ExactIndex)
+    assert isinstance(build_index(vectors, "auto", ann_min_size=100), IVFIndex)
+
+
+def test_ranker_with_ivf_index_returns_nearest_destination():
+    vectors = random_unit_vectors(3000, 16)
+    destinations = [{"name": f"dest-{i}", "average_cost": 1000.0} for i in range(len(vectors))]
+    ranker = DestinationRanker(destinations, vectors, index_kind="ivf")
+    results = ranker.rank(vectors[42], limit=3, budget=1000)
+    assert results[0]["name"] == "dest-42"